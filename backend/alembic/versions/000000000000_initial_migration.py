@@ -7,6 +7,12 @@ from alembic import op
 import sqlalchemy as sa
 import sqlmodel
 
+# revision identifiers
+revision = '000000000000'
+down_revision = None
+branch_labels = None
+depends_on = None
+
 # This is an example initial migration - you would customize this for your actual models
 def upgrade() -> None:
     # Create users table
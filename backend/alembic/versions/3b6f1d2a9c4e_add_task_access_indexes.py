@@ -0,0 +1,64 @@
+"""Add composite and partial indexes for task access patterns
+
+Revision ID: 3b6f1d2a9c4e
+Revises: 5d8e2f1c7a90
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '3b6f1d2a9c4e'
+down_revision = '5d8e2f1c7a90'
+branch_labels = None
+depends_on = None
+
+# Every task query filters by user_id first, so each index leads with it
+COMPOSITE_INDEXES = {
+    'ix_tasks_user_id_created_at': ['user_id', 'created_at'],
+    'ix_tasks_user_id_completed_due_date': ['user_id', 'completed', 'due_date'],
+    'ix_tasks_user_id_due_date': ['user_id', 'due_date'],
+    'ix_tasks_user_id_priority_created_at': ['user_id', 'priority', 'created_at'],
+    'ix_tasks_user_id_starred_created_at': ['user_id', 'starred', 'created_at'],
+    'ix_tasks_user_id_updated_at': ['user_id', 'updated_at'],
+}
+
+# Indexes this revision replaces: the single-column ones from
+# run_migration.py are never chosen over a user_id-scoped index, and the
+# (user_id, priority)/(user_id, starred) ones from migration 002 still
+# needed a sort for the default created_at order
+REPLACED_INDEXES = {
+    'idx_tasks_priority': ['priority'],
+    'idx_tasks_starred': ['starred'],
+    'idx_tasks_due_date': ['due_date'],
+    'ix_tasks_user_id_priority': ['user_id', 'priority'],
+    'ix_tasks_user_id_starred': ['user_id', 'starred'],
+}
+
+
+def upgrade() -> None:
+    for name in REPLACED_INDEXES:
+        op.drop_index(name, table_name='tasks', if_exists=True)
+
+    for name, columns in COMPOSITE_INDEXES.items():
+        op.create_index(name, 'tasks', columns, if_not_exists=True)
+
+    # Open tasks only: the default "active" view, newest first
+    op.create_index(
+        'ix_tasks_open_user_id_created_at', 'tasks', ['user_id', 'created_at'],
+        postgresql_where=sa.text('NOT completed'),
+        sqlite_where=sa.text('completed = 0'),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_open_user_id_created_at', table_name='tasks', if_exists=True)
+
+    for name in COMPOSITE_INDEXES:
+        op.drop_index(name, table_name='tasks', if_exists=True)
+
+    for name, columns in REPLACED_INDEXES.items():
+        op.create_index(name, 'tasks', columns, if_not_exists=True)
@@ -0,0 +1,41 @@
+"""Add the enhanced task fields (priority, starred, tags, due_date)
+
+Revision ID: 5d8e2f1c7a90
+Revises: 000000000000
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '5d8e2f1c7a90'
+down_revision = '000000000000'
+branch_labels = None
+depends_on = None
+
+# Same columns as migrations/001_add_enhanced_task_fields.sql; its
+# single-column indexes are left out, revision 3b6f1d2a9c4e drops them
+ENHANCED_COLUMNS = [
+    sa.Column('priority', sa.String(length=10), nullable=False, server_default='medium'),
+    sa.Column('starred', sa.Boolean(), nullable=False, server_default=sa.false()),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+]
+
+
+def upgrade() -> None:
+    # Databases built by SQLModel (or migration 001) already have some or all of them
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('tasks')}
+    missing = [column for column in ENHANCED_COLUMNS if column.name not in existing]
+    if missing:
+        with op.batch_alter_table('tasks') as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        for column in reversed(ENHANCED_COLUMNS):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,53 @@
+"""Add the per-user change sequence used by delta sync
+
+Revision ID: 7c1e9a4d2b6f
+Revises: 9a4f3c2e6b1d
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '7c1e9a4d2b6f'
+down_revision = '9a4f3c2e6b1d'
+branch_labels = None
+depends_on = None
+
+CHANGE_SEQ_TABLES = ['tasks', 'task_deletions']
+
+
+def upgrade() -> None:
+    # Databases built by SQLModel already have some or all of this
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('task_versions'):
+        op.create_table(
+            'task_versions',
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('version', sa.Integer(), nullable=False),
+        )
+
+    # Existing rows get 0, so the next sync from the beginning delivers them
+    for table in CHANGE_SEQ_TABLES:
+        columns = {column['name'] for column in inspector.get_columns(table)}
+        if 'change_seq' not in columns:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(sa.Column('change_seq', sa.Integer(), nullable=False, server_default='0'))
+        op.create_index(f'ix_{table}_user_id_change_seq', table, ['user_id', 'change_seq', 'id'], if_not_exists=True)
+
+    op.drop_index('ix_task_deletions_user_id_deleted_at', table_name='task_deletions', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_task_deletions_user_id_deleted_at', 'task_deletions', ['user_id', 'deleted_at'], if_not_exists=True
+    )
+
+    for table in CHANGE_SEQ_TABLES:
+        op.drop_index(f'ix_{table}_user_id_change_seq', table_name=table, if_exists=True)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('change_seq')
+
+    op.drop_table('task_versions')
@@ -0,0 +1,56 @@
+"""Add the task_deletions, tags and task_tags tables
+
+Revision ID: 9a4f3c2e6b1d
+Revises: 3b6f1d2a9c4e
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '9a4f3c2e6b1d'
+down_revision = '3b6f1d2a9c4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases built by SQLModel (or migrations 003/004) may have them already
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    # Tombstones for delta sync (migration 003)
+    if 'task_deletions' not in tables:
+        op.create_table(
+            'task_deletions',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('task_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_task_deletions_user_id_deleted_at', 'task_deletions', ['user_id', 'deleted_at'])
+
+    # Indexed tags (migration 004); fill them with python backfill_task_tags.py
+    if 'tags' not in tables:
+        op.create_table(
+            'tags',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.UniqueConstraint('user_id', 'name', name='uq_tags_user_id_name'),
+        )
+    if 'task_tags' not in tables:
+        op.create_table(
+            'task_tags',
+            sa.Column('task_id', sa.Integer(), sa.ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('tag_id', sa.Integer(), sa.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+        )
+        op.create_index('ix_task_tags_tag_id', 'task_tags', ['tag_id'])
+
+
+def downgrade() -> None:
+    op.drop_table('task_tags')
+    op.drop_table('tags')
+    op.drop_table('task_deletions')
@@ -0,0 +1,36 @@
+"""Rewrite second-precision SQLite timestamps with microseconds
+
+Revision ID: b8d2e5f1a3c7
+Revises: e4a7b2c9d1f3
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = 'b8d2e5f1a3c7'
+down_revision = 'e4a7b2c9d1f3'
+branch_labels = None
+depends_on = None
+
+# Must match SQLITE_TIMESTAMP_COLUMNS in app/database.py
+TIMESTAMP_COLUMNS = [
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('tasks', 'created_at'),
+    ('tasks', 'updated_at'),
+]
+
+
+def upgrade() -> None:
+    # PostgreSQL compares timestamps by value; only SQLite's text needs it
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, column in TIMESTAMP_COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = {column} || '.000000' WHERE length({column}) = 19")
+
+
+def downgrade() -> None:
+    # The rewritten values are equivalent; nothing to undo
+    pass
@@ -0,0 +1,39 @@
+"""Add the PostgreSQL full-text search column and index
+
+Revision ID: e4a7b2c9d1f3
+Revises: 7c1e9a4d2b6f
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = 'e4a7b2c9d1f3'
+down_revision = '7c1e9a4d2b6f'
+branch_labels = None
+depends_on = None
+
+# Must match SEARCH_CONFIG in app/database.py
+SEARCH_CONFIG = 'english'
+
+
+def upgrade() -> None:
+    # SQLite searches an FTS5 table created on startup instead
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(f"""
+        ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_tasks_search_vector")
+    op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector")
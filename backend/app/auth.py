@@ -3,36 +3,51 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt, JWTError
+import logging
 import os
-from passlib.context import CryptContext
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from .config import settings
 from .database import get_db
+from .hashing import PasswordHashQueueFull, password_hasher
 from .models import User
 from .crud import get_user_by_email
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .token_cache import token_cache
 
 # JWT configuration
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-print(f"[AUTH] SECRET_KEY loaded: {SECRET_KEY[:10]}...")
-print(f"[AUTH] ALGORITHM: {ALGORITHM}")
+logger = logging.getLogger(__name__)
+
+if SECRET_KEY == "your-secret-key-change-in-production":
+    logger.warning("SECRET_KEY is the built-in default; set it in the environment")
 
 security = HTTPBearer()
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _hashing_unavailable():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHashQueueFull:
+        raise _hashing_unavailable()
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHashQueueFull:
+        raise _hashing_unavailable()
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -45,58 +60,95 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
     to_encode.update({"exp": expire, "type": "access"})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    print(f"[AUTH] Token created for user_id: {data.get('sub')}")
+    logger.debug("Access token issued", extra={"user_id": data.get("sub")})
     return encoded_jwt
 
 
-def get_current_user_from_token(token: str):
-    """Get the current user from the JWT token."""
-    print(f"[AUTH] Decoding token: {token[:20]}...")
+def decode_access_token(token: str) -> dict:
+    """Decode and validate an access token, returning its payload."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id_str = payload.get("sub")
         token_type: str = payload.get("type")
 
-        print(f"[AUTH] Decoded payload - user_id: {user_id_str}, type: {token_type}")
-
         if user_id_str is None or token_type != "access":
-            print(f"[AUTH] Invalid token - user_id: {user_id_str}, type: {token_type}")
+            logger.info("Rejected token: missing subject or wrong type", extra={"token_type": token_type})
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        # Convert string back to int
-        user_id = int(user_id_str)
-        return user_id
+        return payload
     except jwt.ExpiredSignatureError:
-        print("[AUTH] Token expired")
+        logger.debug("Rejected token: expired")
         raise HTTPException(status_code=401, detail="Token expired")
     except JWTError as e:
-        print(f"[AUTH] JWT Error: {e}")
+        logger.info("Rejected token: %s", e)
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
+def create_stream_ticket(user_id: int) -> str:
+    """
+    Create a short-lived ticket that only opens the user's event stream.
+
+    EventSource can't send headers, so its credential ends up in the URL
+    and in access logs; a ticket leaked that way expires within
+    EVENT_TICKET_EXPIRE_SECONDS and is rejected everywhere else.
+    """
+    expire = datetime.utcnow() + timedelta(seconds=settings.EVENT_TICKET_EXPIRE_SECONDS)
+    return jwt.encode({"sub": str(user_id), "exp": expire, "type": "stream"}, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def decode_stream_ticket(ticket: str) -> int:
+    """Validate a stream ticket and return its user id."""
+    try:
+        payload = jwt.decode(ticket, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Ticket expired")
+    except JWTError as e:
+        logger.info("Rejected stream ticket: %s", e)
+        raise HTTPException(status_code=401, detail="Invalid ticket")
+    if payload.get("type") != "stream" or payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid ticket")
+    return int(payload["sub"])
+
+
+def get_current_user_from_token(token: str):
+    """Get the current user from the JWT token."""
+    payload = decode_access_token(token)
+    # Convert string back to int
+    return int(payload["sub"])
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get the current user from the JWT token."""
-    token = credentials.credentials
-    print(f"[AUTH] Received token in header: {token[:20] if token else 'None'}...")
+    return await get_user_id_for_token(credentials.credentials, db)
+
+
+async def get_user_id_for_token(token: str, db: AsyncSession) -> int:
+    """Resolve an access token to the id of an existing user."""
+    # Tokens already verified against the database skip both the signature
+    # check and the user lookup until they expire
+    cached_user_id = token_cache.get(token)
+    if cached_user_id is not None:
+        return cached_user_id
 
-    user_id = get_current_user_from_token(token)
+    payload = decode_access_token(token)
+    user_id = int(payload["sub"])
 
     # Verify that the user exists in the database
-    user = db.get(User, user_id)
+    user = await db.get(User, user_id)
     if user is None:
-        print(f"[AUTH] User {user_id} not found in database")
+        logger.info("Rejected token: user no longer exists", extra={"user_id": user_id})
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    print(f"[AUTH] Authenticated user_id: {user.id}")
+    token_cache.set(token, user.id, payload["exp"])
     return user.id
 
 
-def authenticate_user(db: Session, email: str, password: str):
+async def authenticate_user(db: AsyncSession, email: str, password: str):
     """Authenticate a user against the database."""
-    user = get_user_by_email(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+    user = await get_user_by_email(db, email)
+    if not user or not await verify_password(password, user.hashed_password):
         return None
     return user
@@ -0,0 +1,218 @@
+import zlib
+from typing import List, Optional, Sequence
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encodings() -> dict:
+    """Content-coding -> (encoder class, level), best first; gzip is always there."""
+    encodings = {}
+    if zstandard is not None:
+        encodings["zstd"] = (_Zstd, 3)
+    if brotli is not None:
+        encodings["br"] = (_Brotli, 4)  # Quality 4 is about gzip's speed at a better ratio
+    encodings["gzip"] = (_Gzip, 6)
+    return encodings
+
+
+def choose_encoding(accept_encoding: str, supported: Sequence[str]) -> Optional[str]:
+    """The first of ``supported`` that Accept-Encoding allows, or None."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for name in supported:
+        if accepted.get(name, wildcard) > 0:
+            return name
+    return None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with zstd, brotli or gzip.
+
+    zstd and brotli are used when their packages are installed and the client
+    accepts them. Only content types in ``content_types`` are touched (never
+    list text/event-stream: compressors hold back output, which stalls live
+    streams). A body under ``minimum_size`` is sent as is; when the length
+    isn't declared up front, chunks are held only until that many bytes
+    arrive. After that every chunk the app sends is compressed and flushed
+    straight through, so streamed responses are neither buffered whole nor
+    held back; streaming endpoints should send chunks of a few KB or more,
+    since each flush costs a little ratio.
+
+    ETags are left untouched: they name the task version that If-Match
+    compares against, whatever the content coding.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, content_types: Sequence[str] = ("application/json",),
+                 encodings: Optional[dict] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = {content_type.lower() for content_type in content_types}
+        self.encodings = encodings if encodings is not None else available_encodings()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding += value.decode("latin-1") + ","
+        encoding = choose_encoding(accept_encoding, list(self.encodings))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(send, encoding, self.encodings[encoding], self.minimum_size, self.content_types)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, send, encoding: str, encoder, minimum_size: int, content_types: set):
+        self._send = send
+        self._encoding = encoding
+        self._encoder_class, self._level = encoder
+        self._minimum_size = minimum_size
+        self._content_types = content_types
+        self._start: Optional[dict] = None
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._encoder = None
+        self._passthrough = False
+
+    async def send(self, message):
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            self._start = message
+            if not self._should_compress(message):
+                self._passthrough = True
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._encoder is None:
+            self._pending.append(body)
+            self._pending_size += len(body)
+            if more_body and self._pending_size < self._minimum_size:
+                return  # Not yet known whether the body is worth compressing
+            held = b"".join(self._pending)
+            self._pending = []
+            if not more_body and self._pending_size < self._minimum_size:
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send({"type": "http.response.body", "body": held, "more_body": False})
+                return
+            self._encoder = self._encoder_class(self._level)
+            await self._send(self._compressed_start())
+            body = held
+
+        compressed = self._encoder.compress(body)
+        if more_body:
+            compressed += self._encoder.flush()
+            await self._send({"type": "http.response.body", "body": compressed, "more_body": True})
+        else:
+            compressed += self._encoder.finish()
+            await self._send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+    def _should_compress(self, start: dict) -> bool:
+        if start["status"] < 200 or start["status"] in (204, 304):
+            return False
+        content_type = b""
+        for name, value in start.get("headers", []):
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+            if name == b"content-length" and int(value) < self._minimum_size:
+                return False
+        media_type = content_type.decode("latin-1").split(";")[0].strip().lower()
+        return media_type in self._content_types
+
+    def _compressed_start(self) -> dict:
+        headers = []
+        vary = None
+        for name, value in self._start.get("headers", []):
+            if name == b"content-length":
+                continue
+            if name == b"vary":
+                vary = value
+                continue
+            headers.append((name, value))
+        headers.append((b"content-encoding", self._encoding.encode("latin-1")))
+        vary = vary + b", Accept-Encoding" if vary else b"Accept-Encoding"
+        headers.append((b"vary", vary))
+        return {**self._start, "headers": headers}
@@ -1,7 +1,10 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 import os
 
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
 
 class Settings(BaseSettings):
     # Database settings - default to SQLite for easy local development
@@ -15,6 +18,76 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # SQLite tuning (ignored for PostgreSQL). With SQLITE_SINGLE_WRITER, writes
+    # go through one dedicated connection while reads use the shared pool
+    SQLITE_WAL: bool = True
+    SQLITE_SINGLE_WRITER: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes; 0 disables memory-mapped I/O
+
+    # Password hashing pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # 0 disables the limit
+
+    # Verified access token cache (0 size disables it)
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # Cached per-user task statistics (0 size disables the cache)
+    TASK_STATS_CACHE_SIZE: int = 10000
+    TASK_STATS_CACHE_TTL_SECONDS: int = 60
+
+    # Maximum number of tasks accepted by the batch create endpoint
+    TASK_BATCH_MAX_SIZE: int = 1000
+
+    # Rows fetched from the database cursor per chunk of a task export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Live change feed: per-connection queue size, SSE keep-alive interval,
+    # an optional redis:// URL to fan events out across workers, and how long
+    # a stream ticket (the EventSource credential) stays valid
+    EVENT_QUEUE_SIZE: int = 100
+    EVENT_HEARTBEAT_SECONDS: int = 15
+    EVENT_BROKER_URL: Optional[str] = None
+    EVENT_TICKET_EXPIRE_SECONDS: int = 60
+
+    # Readiness probe: database ping timeout and how long a result is reused
+    READINESS_TIMEOUT_SECONDS: float = 2.0
+    READINESS_CACHE_SECONDS: float = 5.0
+
+    # Expose Prometheus metrics at /metrics
+    METRICS_ENABLED: bool = True
+
+    # Response compression (gzip, plus brotli/zstd when installed): smallest
+    # body worth compressing and the content types to compress. Never add
+    # text/event-stream; live event streams must not be held back
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: List[str] = [
+        "application/json",
+        "application/x-ndjson",
+        "text/csv",
+        "text/plain",
+        "text/html",
+    ]
+
+    # Logging: level for the app's loggers, "text" or "json" output, and
+    # whether to log every SQL statement
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"
+    SQL_ECHO: bool = False
+
+    @field_validator("LOG_LEVEL")
+    @classmethod
+    def check_log_level(cls, value: str) -> str:
+        # Fail at startup with a clear message rather than inside logging setup
+        level = value.strip().upper()
+        if level not in LOG_LEVELS:
+            raise ValueError(f"must be one of {', '.join(LOG_LEVELS)}")
+        return level
+
     # Application settings
     APP_NAME: str = "Task Manager API - Phase II"
     DEBUG: bool = True
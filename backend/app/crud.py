@@ -1,12 +1,40 @@
-from sqlmodel import Session, select
-from .models import Task, User
+from sqlalchemy import and_, case, column, delete, false, func, insert, literal_column, or_, table, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database import SEARCH_CONFIG
+from .events import change_feed, task_deleted_event, task_event
+from .models import Tag, Task, TaskDeletion, TaskTag, TaskVersion, User
 from .schemas import TaskCreate, TaskUpdate
-from datetime import datetime
+from .stats_cache import task_stats_cache
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import base64
 import json
+import re
+
+TASK_STATUSES = ["all", "active", "completed"]
+TASK_PRIORITIES = ["low", "medium", "high"]
+TASK_SORT_KEYS = ["created_at", "updated_at", "due_date", "title", "priority"]
+SORT_ORDERS = ["asc", "desc"]
+
+# Markers wrapped around matched words in search highlights
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+MAX_SEARCH_TERMS = 16
+
+# Rank used to sort priorities by importance rather than alphabetically
+PRIORITY_RANKS = {"low": 1, "medium": 2, "high": 3}
+PRIORITY_RANK = case(PRIORITY_RANKS, value=Task.priority, else_=2)
+
+
+class PreconditionFailed(Exception):
+    """The task exists but is no longer at any version the caller expected."""
 
 
 def parse_task_tags(task: Task):
-    """Helper function to parse tags from JSON string to list."""
+    """Decode tags still stored as a JSON-encoded string by older versions."""
     if task and task.tags:
         try:
             task.tags = json.loads(task.tags) if isinstance(task.tags, str) else task.tags
@@ -15,22 +43,458 @@ def parse_task_tags(task: Task):
     return task
 
 
-def get_task(db: Session, task_id: int, user_id: int):
+def normalize_tags(tags: Optional[List[str]]) -> List[str]:
+    """
+    Tag names as stored: stripped, without blanks or repeats, in the order
+    given. Task.tags and task_tags are both written from this one list.
+    """
+    stripped = (name.strip() for name in tags or ())
+    return list(dict.fromkeys(name for name in stripped if name))
+
+
+def _decode_tags(tags):
+    """parse_task_tags for a bare column value."""
+    if isinstance(tags, str):
+        try:
+            return json.loads(tags)
+        except ValueError:
+            return []
+    return tags
+
+
+async def get_task(db: AsyncSession, task_id: int, user_id: int):
     """Get a specific task by ID for a specific user."""
     statement = select(Task).where(Task.id == task_id, Task.user_id == user_id)
-    task = db.exec(statement).first()
+    task = (await db.exec(statement)).first()
     return parse_task_tags(task) if task else None
 
 
-def get_tasks(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    """Get all tasks for a specific user."""
-    statement = select(Task).where(Task.user_id == user_id).offset(skip).limit(limit)
-    tasks = db.exec(statement).all()
-    return [parse_task_tags(task) for task in tasks]
+async def get_task_version(db: AsyncSession, task_id: int, user_id: int):
+    """The (id, updated_at) row of a task without loading it, or None if missing."""
+    statement = select(Task.id, Task.updated_at).where(Task.id == task_id, Task.user_id == user_id)
+    return (await db.exec(statement)).first()
 
 
-def create_task(db: Session, task: TaskCreate, user_id: int):
-    """Create a new task for a specific user."""
+async def get_task_list_version(db: AsyncSession, user_id: int) -> int:
+    """
+    The user's TaskVersion counter, 0 before their first write.
+
+    Every task write bumps it (see _next_change_seq), so it versions any list
+    of the user's tasks with one primary-key lookup. Read it before the rows:
+    a write landing in between then only makes the ETag older than the body,
+    which costs a refetch rather than serving a stale cache.
+    """
+    statement = select(TaskVersion.version).where(TaskVersion.user_id == user_id)
+    return (await db.exec(statement)).first() or 0
+
+
+def _version_condition(versions: List[Optional[datetime]]):
+    """WHERE clause matching tasks whose updated_at is one of ``versions`` (None: never set)."""
+    return or_(false(), *[
+        Task.updated_at.is_(None) if version is None else Task.updated_at == version
+        for version in versions
+    ])
+
+
+def _naive_utc(value: Optional[datetime]):
+    """Timestamps are stored as naive UTC; normalise aware inputs to match."""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def task_filters(
+    user_id: int,
+    status: Optional[str] = None,
+    starred: Optional[bool] = None,
+    priority: Optional[str] = None,
+    tag: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    q: Optional[str] = None,
+):
+    """Build the WHERE clauses shared by the task list and bulk endpoints."""
+    conditions = [Task.user_id == user_id]
+
+    if status == "active":
+        conditions.append(Task.completed == False)  # noqa: E712
+    elif status == "completed":
+        conditions.append(Task.completed == True)  # noqa: E712
+
+    if starred is not None:
+        conditions.append(Task.starred == starred)
+
+    if priority:
+        conditions.append(Task.priority == priority)
+
+    if tag:
+        # Resolved through the (user_id, name) unique index and task_tags.tag_id
+        tagged = (
+            select(TaskTag.task_id)
+            .join(Tag, Tag.id == TaskTag.tag_id)
+            .where(Tag.user_id == user_id, Tag.name == tag)
+        )
+        conditions.append(Task.id.in_(tagged))
+
+    if due_after is not None:
+        conditions.append(Task.due_date >= _naive_utc(due_after))
+    if due_before is not None:
+        conditions.append(Task.due_date <= _naive_utc(due_before))
+
+    if q:
+        conditions.append(or_(
+            Task.title.icontains(q, autoescape=True),
+            Task.description.icontains(q, autoescape=True),
+        ))
+
+    return conditions
+
+
+def _sort_column(sort: str):
+    return PRIORITY_RANK if sort == "priority" else getattr(Task, sort)
+
+
+def task_ordering(sort: str = "created_at", order: str = "desc"):
+    """ORDER BY clauses for a sort key, with id as a stable tie-breaker."""
+    column = _sort_column(sort)
+    if order == "asc":
+        return [column.asc().nulls_last(), Task.id.asc()]
+    return [column.desc().nulls_last(), Task.id.desc()]
+
+
+# Ids, change_seq and priority ranks are INTEGER columns/expressions
+MAX_COLUMN_INT = 2 ** 31 - 1
+
+
+def _is_column_int(value) -> bool:
+    """Whether a decoded cursor value is an int (not a bool) an INTEGER column can hold."""
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= MAX_COLUMN_INT
+
+
+def encode_cursor(data: dict) -> str:
+    """Encode a position as an opaque, URL-safe token."""
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a token produced by encode_cursor; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(data, dict):
+        raise ValueError("Invalid cursor")
+    return data
+
+
+def _sort_value(task: Task, sort: str):
+    """The JSON-safe value of a task's sort key, as stored in a cursor."""
+    if sort == "priority":
+        return PRIORITY_RANKS.get(task.priority, 2)
+    value = getattr(task, sort)
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _keyset_condition(cursor: dict, sort: str, order: str):
+    """
+    WHERE clause selecting the rows that sort strictly after the cursor.
+
+    Rows are ordered by (sort key, id) with NULL sort keys last, so a page
+    boundary is resumed with an index range scan instead of an OFFSET.
+    """
+    if cursor.get("sort") != sort or cursor.get("order") != order:
+        raise ValueError("Cursor does not match the requested sort order")
+    last_id = cursor.get("id")
+    value = cursor.get("value")
+    if not _is_column_int(last_id):
+        raise ValueError("Invalid cursor")
+    # The value must have the sort key's type, or the comparison fails in
+    # the database instead of here
+    if sort == "priority":
+        if not _is_column_int(value):
+            raise ValueError("Invalid cursor")
+    elif sort == "title":
+        if not isinstance(value, str):
+            raise ValueError("Invalid cursor")
+    elif value is not None:
+        try:
+            value = _naive_utc(datetime.fromisoformat(value))
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    column = _sort_column(sort)
+    after_id = Task.id > last_id if order == "asc" else Task.id < last_id
+    if value is None:
+        # Already inside the trailing block of NULL sort keys
+        return and_(column.is_(None), after_id)
+    after_value = column > value if order == "asc" else column < value
+    return or_(after_value, and_(column == value, after_id), column.is_(None))
+
+
+def task_list_statement(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    status: Optional[str] = None,
+    starred: Optional[bool] = None,
+    priority: Optional[str] = None,
+    tag: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    q: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    columns: Optional[list] = None,
+):
+    """
+    The SELECT behind one page of the task list (see get_tasks).
+
+    Selects Task entities, or just ``columns`` when given.
+    """
+    conditions = task_filters(
+        user_id,
+        status=status,
+        starred=starred,
+        priority=priority,
+        tag=tag,
+        due_after=due_after,
+        due_before=due_before,
+        q=q,
+    )
+    if cursor:
+        conditions.append(_keyset_condition(decode_cursor(cursor), sort, order))
+
+    # Fetch one extra row to learn whether another page follows
+    return (
+        select(*columns if columns else [Task])
+        .where(*conditions)
+        .order_by(*task_ordering(sort, order))
+        .limit(limit + 1)
+    )
+
+
+async def get_tasks(
+    db: AsyncSession,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    sort: str = "created_at",
+    order: str = "desc",
+    **filters,
+):
+    """
+    Get one page of tasks for a specific user, filtered and sorted in SQL.
+
+    ``filters`` are the keyword filters of task_filters. Returns
+    ``(tasks, next_cursor)``; ``next_cursor`` is None on the last page.
+    Raises ValueError if ``cursor`` is malformed or was issued for a different
+    sort order.
+    """
+    statement = task_list_statement(
+        user_id, cursor=cursor, limit=limit, sort=sort, order=order, **filters
+    )
+    tasks, next_cursor = _page(list((await db.exec(statement)).all()), limit, sort, order)
+    return [parse_task_tags(task) for task in tasks], next_cursor
+
+
+def _page(rows: list, limit: int, sort: str, order: str):
+    """Trim the look-ahead row fetched by task_list_statement and build next_cursor."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor({
+            "sort": sort,
+            "order": order,
+            "value": _sort_value(last, sort),
+            "id": last.id,
+        })
+    return rows, next_cursor
+
+
+# Columns of schemas.Task, in its field order
+TASK_RESPONSE_COLUMNS = [
+    Task.id, Task.title, Task.description, Task.completed, Task.user_id, Task.priority,
+    Task.starred, Task.tags, Task.due_date, Task.created_at, Task.updated_at,
+]
+TASK_FIELDS = {column.key: column for column in TASK_RESPONSE_COLUMNS}
+
+
+def parse_task_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Validate a comma-separated ``fields`` selection of schemas.Task fields.
+
+    Returns the names in schemas.Task order, always including id, or None
+    (every field) when ``fields`` is empty. Raises ValueError on unknown names.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - TASK_FIELDS.keys()
+    if unknown:
+        raise ValueError(
+            "Unknown fields: " + ", ".join(sorted(unknown))
+            + ". Choose from: " + ", ".join(TASK_FIELDS)
+        )
+    requested.add("id")
+    return [name for name in TASK_FIELDS if name in requested]
+
+
+def _task_dict(row, names: List[str]) -> dict:
+    task = {name: getattr(row, name) for name in names}
+    if "tags" in task:
+        task["tags"] = _decode_tags(task["tags"])
+    return task
+
+
+async def get_task_row(db: AsyncSession, task_id: int, user_id: int, fields: Optional[List[str]] = None):
+    """
+    get_task as a dict shaped like schemas.Task, limited to ``fields`` (see
+    parse_task_fields), and its updated_at for the ETag: ``(task, version)``,
+    or None if missing.
+    """
+    names = fields or list(TASK_FIELDS)
+    statement = select(*[TASK_FIELDS[name] for name in names], Task.updated_at.label("version")).where(
+        Task.id == task_id, Task.user_id == user_id
+    )
+    row = (await db.exec(statement)).first()
+    return (_task_dict(row, names), row.version) if row else None
+
+
+async def get_task_rows(
+    db: AsyncSession,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    sort: str = "created_at",
+    order: str = "desc",
+    fields: Optional[List[str]] = None,
+    **filters,
+):
+    """
+    get_tasks for responses: the same page as plain dicts shaped like schemas.Task.
+
+    Selects column tuples rather than entities, skipping ORM identity-map
+    bookkeeping, and the dicts are ready to encode without re-validation.
+    ``fields`` (see parse_task_fields) narrows both the SELECT and the dicts.
+    """
+    names = fields or list(TASK_FIELDS)
+    # The cursor is built from the id and sort key, so fetch them regardless
+    selected = names + [name for name in ("id", sort) if name not in names]
+    statement = task_list_statement(
+        user_id, cursor=cursor, limit=limit, sort=sort, order=order,
+        columns=[TASK_FIELDS[name] for name in selected], **filters
+    )
+    rows, next_cursor = _page(list((await db.exec(statement)).all()), limit, sort, order)
+    return [_task_dict(row, names) for row in rows], next_cursor
+
+
+async def stream_task_rows(
+    db: AsyncSession,
+    user_id: int,
+    fields: Optional[List[str]] = None,
+    batch_size: int = 1000,
+    **filters,
+):
+    """
+    Every task of a user matching ``filters``, oldest first, as batches of
+    dicts like get_task_rows.
+
+    Rows come from a server-side cursor (yield_per), so memory is bounded by
+    ``batch_size`` however many tasks there are, and the first batch is
+    available before the query has finished.
+    """
+    names = fields or list(TASK_FIELDS)
+    statement = (
+        select(*[TASK_FIELDS[name] for name in names])
+        .where(*task_filters(user_id, **filters))
+        .order_by(*task_ordering("created_at", "asc"))
+        .execution_options(yield_per=batch_size)
+    )
+    result = await db.stream(statement)
+    async for rows in result.partitions():
+        yield [_task_dict(row, names) for row in rows]
+
+
+def search_terms(q: str) -> List[str]:
+    """Split a search box query into plain words, dropping query syntax."""
+    return re.findall(r"[^\W_]+", q)[:MAX_SEARCH_TERMS]
+
+
+async def search_tasks(db: AsyncSession, user_id: int, q: str, limit: int = 20):
+    """
+    Full-text search over a user's task titles and descriptions.
+
+    Every word must match, each as a prefix so partial words find results
+    while typing. Hits come back best first as dicts holding the task, its
+    rank (higher is better) and the title and description with matches
+    wrapped in HIGHLIGHT_START/HIGHLIGHT_STOP. Raises ValueError if the
+    query has no searchable words.
+    """
+    terms = search_terms(q)
+    if not terms:
+        raise ValueError("Search query must contain letters or digits")
+
+    if db.get_bind().dialect.name == "postgresql":
+        config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+        search_vector = literal_column("tasks.search_vector")
+        query = func.to_tsquery(config, " & ".join(f"{term}:*" for term in terms))
+        rank = func.ts_rank(search_vector, query).label("search_rank")
+        # Rank and limit first so headlines are only built for the returned rows
+        hits = (
+            select(Task.id, rank)
+            .where(Task.user_id == user_id, search_vector.op("@@")(query))
+            .order_by(rank.desc(), Task.id.desc())
+            .limit(limit)
+            .subquery()
+        )
+        highlight = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}"
+        statement = (
+            select(
+                Task,
+                hits.c.search_rank,
+                func.ts_headline(config, Task.title, query, f"{highlight}, HighlightAll=true"),
+                func.ts_headline(config, Task.description, query, highlight),
+            )
+            .join(hits, hits.c.id == Task.id)
+            .order_by(hits.c.search_rank.desc(), Task.id.desc())
+        )
+    else:
+        fts = table("tasks_fts", column("rowid"))
+        fts_table = literal_column("tasks_fts")
+        match = " ".join(f'"{term}"*' for term in terms)
+        # bm25 is lower-is-better; weight title matches above description ones
+        rank = (-func.bm25(fts_table, 10.0, 1.0)).label("search_rank")
+        statement = (
+            select(
+                Task,
+                rank,
+                func.highlight(fts_table, 0, HIGHLIGHT_START, HIGHLIGHT_STOP),
+                func.snippet(fts_table, 1, HIGHLIGHT_START, HIGHLIGHT_STOP, "…", 16),
+            )
+            .select_from(fts)
+            .join(Task, Task.id == fts.c.rowid)
+            .where(fts_table.op("MATCH")(match), Task.user_id == user_id)
+            .order_by(rank.desc(), Task.id.desc())
+            .limit(limit)
+        )
+
+    results = await db.exec(statement)
+    return [
+        {
+            "task": parse_task_tags(task),
+            "rank": float(search_rank),
+            "title_highlight": title_highlight,
+            "description_highlight": description_highlight or None,
+        }
+        for task, search_rank, title_highlight, description_highlight in results.all()
+    ]
+
+
+def _task_create_values(task: TaskCreate, user_id: int) -> dict:
+    """Column values for a new task row."""
     # Parse due_date if provided
     due_date_obj = None
     if task.due_date:
@@ -39,82 +503,518 @@ def create_task(db: Session, task: TaskCreate, user_id: int):
         except:
             pass
 
-    # Convert tags list to JSON string
-    tags_json = json.dumps(task.tags) if task.tags else None
-
-    db_task = Task(
+    return dict(
         title=task.title,
         description=task.description,
         completed=task.completed,
         priority=task.priority,
         starred=task.starred,
-        tags=tags_json,
+        tags=normalize_tags(task.tags) or None,
         due_date=due_date_obj,
         user_id=user_id
     )
+
+
+async def _next_change_seq(db: AsyncSession, user_id: int) -> int:
+    """
+    Bump the user's TaskVersion counter and return the new value.
+
+    Call it before any other write in the transaction: the counter row stays
+    locked until commit, so concurrent writers for the same user queue on it
+    and their change_seq values follow commit order.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = (
+            dialect_insert(TaskVersion)
+            .values(user_id=user_id, version=1)
+            .on_conflict_do_update(index_elements=["user_id"], set_={"version": TaskVersion.version + 1})
+            .returning(TaskVersion.version)
+        )
+        return (await db.exec(statement)).scalar_one()
+
+    statement = select(TaskVersion).where(TaskVersion.user_id == user_id).with_for_update()
+    counter = (await db.exec(statement)).first()
+    if counter is None:
+        counter = TaskVersion(user_id=user_id, version=0)
+    counter.version += 1
+    db.add(counter)
+    await db.flush()
+    return counter.version
+
+
+async def _ensure_tags(db: AsyncSession, user_id: int, names: List[str]) -> Dict[str, int]:
+    """Create any missing tags for the user and return their ids by name."""
+    rows = [{"user_id": user_id, "name": name} for name in names]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = dialect_insert(Tag).values(rows).on_conflict_do_nothing(
+            index_elements=["user_id", "name"]
+        )
+        await db.exec(statement)
+    else:
+        existing = set((await db.exec(
+            select(Tag.name).where(Tag.user_id == user_id, Tag.name.in_(names))
+        )).all())
+        missing = [row for row in rows if row["name"] not in existing]
+        if missing:
+            await db.exec(insert(Tag), params=missing)
+
+    statement = select(Tag.id, Tag.name).where(Tag.user_id == user_id, Tag.name.in_(names))
+    return {name: tag_id for tag_id, name in (await db.exec(statement)).all()}
+
+
+async def _replace_task_tags(
+    db: AsyncSession,
+    user_id: int,
+    tags_by_task: Dict[int, Optional[List[str]]],
+    new_tasks: bool = False,
+):
+    """Point each task's task_tags rows at exactly the given (normalized) tag names."""
+    names = list(dict.fromkeys(name for tags in tags_by_task.values() for name in tags or ()))
+    tag_ids = await _ensure_tags(db, user_id, names) if names else {}
+
+    if not new_tasks:
+        await db.exec(delete(TaskTag).where(TaskTag.task_id.in_(list(tags_by_task))))
+
+    links = [
+        {"task_id": task_id, "tag_id": tag_ids[name]}
+        for task_id, tags in tags_by_task.items()
+        for name in tags or ()
+    ]
+    if links:
+        await db.exec(insert(TaskTag), params=links)
+
+
+async def create_task(db: AsyncSession, task: TaskCreate, user_id: int):
+    """Create a new task for a specific user."""
+    change_seq = await _next_change_seq(db, user_id)
+    db_task = Task(**_task_create_values(task, user_id), change_seq=change_seq)
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
-    return parse_task_tags(db_task)
+    if db_task.tags:
+        await db.flush()
+        await _replace_task_tags(db, user_id, {db_task.id: db_task.tags}, new_tasks=True)
+    await db.commit()
+    await db.refresh(db_task)
+    parse_task_tags(db_task)
+    await change_feed.publish(user_id, task_event("task.created", db_task))
+    return db_task
 
 
-def update_task(db: Session, task_id: int, task_update: TaskUpdate, user_id: int):
-    """Update a specific task for a specific user."""
-    statement = select(Task).where(Task.id == task_id, Task.user_id == user_id)
-    db_task = db.exec(statement).first()
+async def create_tasks(db: AsyncSession, tasks: List[TaskCreate], user_id: int):
+    """
+    Create many tasks for a specific user in one transaction.
 
-    if db_task is None:
-        return None
+    Uses multi-row INSERT ... RETURNING where the dialect can return rows in
+    parameter order; otherwise the ORM flushes the batch and fills in ids.
+    The created tasks are returned in the same order as ``tasks``.
+    """
+    if not tasks:
+        return []
+    change_seq = await _next_change_seq(db, user_id)
+    rows = [{**_task_create_values(task, user_id), "change_seq": change_seq} for task in tasks]
+
+    dialect = db.get_bind().dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        statement = insert(Task).returning(Task, sort_by_parameter_order=True)
+        result = await db.exec(statement, params=rows)
+        created = list(result.scalars().all())
+    else:
+        created = [Task(**row) for row in rows]
+        db.add_all(created)
+        await db.flush()
 
-    # Update basic fields
+    tags_by_task = {task.id: task.tags for task in created if task.tags}
+    if tags_by_task:
+        await _replace_task_tags(db, user_id, tags_by_task, new_tasks=True)
+
+    await db.commit()
+    created = [parse_task_tags(task) for task in created]
+    await change_feed.publish(user_id, *[task_event("task.created", task) for task in created])
+    return created
+
+
+async def update_task(
+    db: AsyncSession,
+    task_id: int,
+    task_update: TaskUpdate,
+    user_id: int,
+    expected_versions: Optional[List[Optional[datetime]]] = None,
+):
+    """
+    Update a specific task for a specific user.
+
+    With ``expected_versions`` (updated_at values, e.g. from If-Match) the
+    update only applies if the task is still at one of them; otherwise
+    PreconditionFailed is raised.
+    """
+    values = _task_update_values(task_update)
+    if not values:
+        db_task = await get_task(db, task_id=task_id, user_id=user_id)
+        if db_task is not None and expected_versions is not None and db_task.updated_at not in expected_versions:
+            raise PreconditionFailed()
+        return db_task
+
+    values["change_seq"] = await _next_change_seq(db, user_id)
+    conditions = [Task.id == task_id, Task.user_id == user_id]
+    if expected_versions is not None:
+        conditions.append(_version_condition(expected_versions))
+
+    if _supports_returning(db, "update"):
+        # One ownership-scoped round-trip: UPDATE ... WHERE id AND user_id RETURNING *
+        statement = (
+            update(Task)
+            .where(*conditions)
+            .values(**values)
+            .returning(Task)
+        )
+        result = await db.exec(statement, execution_options={"synchronize_session": False})
+        db_task = result.scalars().first()
+        if db_task is None:
+            await db.rollback()
+            if expected_versions is not None and await get_task_version(db, task_id, user_id):
+                raise PreconditionFailed()
+            return None
+        if "tags" in values:
+            await _replace_task_tags(db, user_id, {task_id: values["tags"]})
+        await db.commit()
+    else:
+        statement = select(Task).where(Task.id == task_id, Task.user_id == user_id)
+        db_task = (await db.exec(statement)).first()
+
+        if db_task is None:
+            await db.rollback()
+            return None
+        if expected_versions is not None and db_task.updated_at not in expected_versions:
+            await db.rollback()
+            raise PreconditionFailed()
+
+        for field, value in values.items():
+            setattr(db_task, field, value)
+
+        db.add(db_task)
+        if "tags" in values:
+            await _replace_task_tags(db, user_id, {task_id: values["tags"]})
+        await db.commit()
+        await db.refresh(db_task)
+
+    parse_task_tags(db_task)
+    await change_feed.publish(user_id, task_event("task.updated", db_task))
+    return db_task
+
+
+async def delete_task(
+    db: AsyncSession,
+    task_id: int,
+    user_id: int,
+    expected_versions: Optional[List[Optional[datetime]]] = None,
+):
+    """
+    Delete a specific task for a specific user.
+
+    ``expected_versions`` works as in update_task.
+    """
+    change_seq = await _next_change_seq(db, user_id)
+    # A single ownership-scoped DELETE; the row count says whether it existed
+    conditions = [Task.id == task_id, Task.user_id == user_id]
+    if expected_versions is not None:
+        conditions.append(_version_condition(expected_versions))
+    statement = delete(Task).where(*conditions)
+    result = await db.exec(statement, execution_options={"synchronize_session": False})
+    deleted = result.rowcount > 0
+    if deleted:
+        db.add(TaskDeletion(task_id=task_id, user_id=user_id, change_seq=change_seq))
+        await db.commit()
+    else:
+        await db.rollback()
+    if deleted:
+        await change_feed.publish(user_id, task_deleted_event(task_id))
+    elif expected_versions is not None and await get_task_version(db, task_id, user_id):
+        raise PreconditionFailed()
+    return deleted
+
+
+def _supports_returning(db: AsyncSession, kind: str) -> bool:
+    """Whether the bound dialect supports INSERT/UPDATE/DELETE ... RETURNING."""
+    return getattr(db.get_bind().dialect, f"{kind}_returning", False)
+
+
+def _task_update_values(task_update: TaskUpdate) -> dict:
+    """Column values for the fields that are set on a TaskUpdate."""
+    values = {}
     for field in ['title', 'description', 'completed', 'priority', 'starred']:
         value = getattr(task_update, field, None)
         if value is not None:
-            setattr(db_task, field, value)
+            values[field] = value
 
-    # Handle tags (convert list to JSON)
     if task_update.tags is not None:
-        db_task.tags = json.dumps(task_update.tags)
+        values["tags"] = normalize_tags(task_update.tags)
 
     # Handle due_date (convert string to datetime)
     if task_update.due_date is not None:
         try:
-            db_task.due_date = datetime.fromisoformat(task_update.due_date.replace('Z', '+00:00'))
+            values["due_date"] = datetime.fromisoformat(task_update.due_date.replace('Z', '+00:00'))
         except:
             pass
 
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
-    return parse_task_tags(db_task)
+    return values
 
 
-def delete_task(db: Session, task_id: int, user_id: int):
-    """Delete a specific task for a specific user."""
-    statement = select(Task).where(Task.id == task_id, Task.user_id == user_id)
-    db_task = db.exec(statement).first()
+def _bulk_conditions(user_id: int, ids: Optional[List[int]], filters: Optional[dict]):
+    conditions = task_filters(user_id, **(filters or {}))
+    if ids is not None:
+        conditions.append(Task.id.in_(ids))
+    return conditions
+
+
+async def bulk_update_tasks(
+    db: AsyncSession,
+    user_id: int,
+    task_update: TaskUpdate,
+    ids: Optional[List[int]] = None,
+    filters: Optional[dict] = None,
+) -> List[int]:
+    """
+    Apply the same changes to every matching task in one UPDATE statement.
+
+    Tasks are matched by ``ids`` and/or the task_filters keyword arguments in
+    ``filters``, always scoped to ``user_id``. Returns the affected task ids.
+    """
+    conditions = _bulk_conditions(user_id, ids, filters)
+    values = _task_update_values(task_update)
+    values["change_seq"] = await _next_change_seq(db, user_id)
+
+    if _supports_returning(db, "update"):
+        statement = update(Task).where(*conditions).values(**values).returning(Task)
+        result = await db.exec(statement, execution_options={"synchronize_session": False})
+        updated = list(result.scalars().all())
+    else:
+        # Resolve the ids first (same transaction), then update by primary key
+        task_ids = list((await db.exec(select(Task.id).where(*conditions))).all())
+        updated = []
+        if task_ids:
+            statement = update(Task).where(Task.id.in_(task_ids)).values(**values)
+            await db.exec(statement, execution_options={"synchronize_session": False})
+            updated = list((await db.exec(select(Task).where(Task.id.in_(task_ids)))).all())
+
+    if not updated:
+        await db.rollback()
+        return []
+    if "tags" in values:
+        await _replace_task_tags(db, user_id, {task.id: values["tags"] for task in updated})
+
+    await db.commit()
+    await change_feed.publish(
+        user_id, *[task_event("task.updated", parse_task_tags(task)) for task in updated]
+    )
+    return sorted(task.id for task in updated)
+
+
+async def bulk_delete_tasks(
+    db: AsyncSession,
+    user_id: int,
+    ids: Optional[List[int]] = None,
+    filters: Optional[dict] = None,
+) -> List[int]:
+    """Delete every matching task in one DELETE statement; returns their ids."""
+    conditions = _bulk_conditions(user_id, ids, filters)
+    change_seq = await _next_change_seq(db, user_id)
+
+    if _supports_returning(db, "delete"):
+        statement = delete(Task).where(*conditions).returning(Task.id)
+        result = await db.exec(statement, execution_options={"synchronize_session": False})
+        task_ids = list(result.scalars().all())
+    else:
+        task_ids = list((await db.exec(select(Task.id).where(*conditions))).all())
+        if task_ids:
+            statement = delete(Task).where(Task.id.in_(task_ids))
+            await db.exec(statement, execution_options={"synchronize_session": False})
+
+    if not task_ids:
+        await db.rollback()
+        return []
+    await db.exec(
+        insert(TaskDeletion),
+        params=[
+            {"task_id": task_id, "user_id": user_id, "change_seq": change_seq}
+            for task_id in task_ids
+        ],
+    )
+
+    await db.commit()
+    await change_feed.publish(user_id, *[task_deleted_event(task_id) for task_id in task_ids])
+    return sorted(task_ids)
+
+
+def _after_position(seq_column, id_column, position):
+    """
+    (change_seq, id) strictly after a position recorded in a sync watermark.
+
+    Positions of watermarks issued before change_seq existed hold an
+    updated_at timestamp instead; those restart the feed from the beginning.
+    Raises ValueError for anything else.
+    """
+    if position is None:
+        return None
+    if not isinstance(position, list) or len(position) != 2 or not _is_column_int(position[1]):
+        raise ValueError("Invalid watermark")
+    seq, last_id = position
+    if isinstance(seq, str):
+        datetime.fromisoformat(seq)
+        return None
+    if not _is_column_int(seq):
+        raise ValueError("Invalid watermark")
+    return or_(seq_column > seq, and_(seq_column == seq, id_column > last_id))
+
 
-    if db_task is None:
-        return False
+async def get_task_changes(
+    db: AsyncSession,
+    user_id: int,
+    since: Optional[str] = None,
+    limit: int = 1000,
+):
+    """
+    Tasks created or updated, and ids of tasks deleted, after a watermark.
 
-    db.delete(db_task)
-    db.commit()
-    return True
+    The watermark is an opaque token recording the last (change_seq, id) of
+    tasks and of tombstones already delivered, so both are read with an
+    index range scan on (user_id, change_seq, id). change_seq follows commit
+    order (see _next_change_seq), so a write that commits after a poll can
+    never land behind its watermark, whatever its timestamps. Without ``since``
+    the feed starts from the beginning. At most ``limit`` rows of each kind are
+    returned; ``has_more`` tells the caller to poll again straight away.
+    Clients should apply changes idempotently.
+
+    Returns ``(tasks, deleted_ids, watermark, has_more)``. Raises ValueError
+    for a malformed watermark.
+    """
+    try:
+        position = decode_cursor(since) if since else {}
+        task_after = _after_position(Task.change_seq, Task.id, position.get("tasks"))
+        deletion_after = _after_position(
+            TaskDeletion.change_seq, TaskDeletion.id, position.get("deletions")
+        )
+    except ValueError:
+        raise ValueError("Invalid watermark")
+
+    statement = select(Task).where(Task.user_id == user_id)
+    if task_after is not None:
+        statement = statement.where(task_after)
+    statement = statement.order_by(Task.change_seq, Task.id).limit(limit + 1)
+    tasks = list((await db.exec(statement)).all())
+
+    # SQLite reuses the id of the newest row once it is deleted, so a live
+    # task of this user with a tombstone's id was created after that delete;
+    # the tombstone is stale and would make clients drop the new task
+    recreated = (
+        select(Task.id)
+        .where(Task.id == TaskDeletion.task_id, Task.user_id == TaskDeletion.user_id)
+        .exists()
+    )
+    statement = select(TaskDeletion).where(TaskDeletion.user_id == user_id, ~recreated)
+    if deletion_after is not None:
+        statement = statement.where(deletion_after)
+    statement = statement.order_by(TaskDeletion.change_seq, TaskDeletion.id).limit(limit + 1)
+    deletions = list((await db.exec(statement)).all())
+
+    has_more = len(tasks) > limit or len(deletions) > limit
+    tasks, deletions = tasks[:limit], deletions[:limit]
+
+    if tasks:
+        position["tasks"] = [tasks[-1].change_seq, tasks[-1].id]
+    if deletions:
+        position["deletions"] = [deletions[-1].change_seq, deletions[-1].id]
+
+    return (
+        [parse_task_tags(task) for task in tasks],
+        [deletion.task_id for deletion in deletions],
+        encode_cursor(position),
+        has_more,
+    )
+
+
+def _round_half_up(value: float) -> int:
+    """Round a non-negative number like JavaScript's Math.round (halves up, not to even)."""
+    return int(value + 0.5)
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+async def get_task_stats(db: AsyncSession, user_id: int) -> dict:
+    """
+    Dashboard statistics for a user's tasks.
+
+    Served from task_stats_cache while the user's TaskVersion counter is
+    unchanged; a miss runs one aggregate query over the user's tasks.
+    """
+    # Read before the aggregate, so a write landing in between leaves the
+    # entry keyed on the older version rather than caching stale numbers
+    version = await get_task_list_version(db, user_id)
+    stats = task_stats_cache.get(user_id, version)
+    if stats is not None:
+        return stats
+
+    now = _naive_utc(datetime.now(timezone.utc))
+    statement = select(
+        func.count(Task.id),
+        _count_where(Task.completed),
+        _count_where(Task.starred),
+        _count_where(Task.priority == "high"),
+        _count_where(Task.priority == "medium"),
+        _count_where(Task.priority == "low"),
+        _count_where(and_(Task.completed == False, Task.due_date < now)),  # noqa: E712
+    ).where(Task.user_id == user_id)
+    total, completed, starred, high, medium, low, overdue = (await db.exec(statement)).one()
+
+    stats = {
+        "total": total,
+        "completed": completed,
+        "active": total - completed,
+        "completion_rate": _round_half_up(completed / total * 100) if total else 0,
+        "starred": starred,
+        "high_priority": high,
+        "medium_priority": medium,
+        "low_priority": low,
+        "overdue": overdue,
+        # Same weighting the dashboard has always shown
+        "productivity_score": (
+            min(100, _round_half_up((completed + starred * 2 + high * 3) / total * 100)) if total else 0
+        ),
+    }
+    task_stats_cache.set(user_id, stats, version)
+    return stats
+
+
+async def get_tag_counts(db: AsyncSession, user_id: int):
+    """Number of tasks carrying each of the user's tags, most used first."""
+    task_count = func.count(TaskTag.task_id)
+    statement = (
+        select(Tag.name, task_count)
+        .join(TaskTag, TaskTag.tag_id == Tag.id)
+        .where(Tag.user_id == user_id)
+        .group_by(Tag.id, Tag.name)
+        .order_by(task_count.desc(), Tag.name)
+    )
+    return [{"name": name, "count": count} for name, count in (await db.exec(statement)).all()]
 
 
-def get_user(db: Session, user_id: int):
+async def get_user(db: AsyncSession, user_id: int):
     """Get a user by ID."""
     statement = select(User).where(User.id == user_id)
-    return db.exec(statement).first()
+    return (await db.exec(statement)).first()
 
 
-def get_user_by_email(db: Session, email: str):
+async def get_user_by_email(db: AsyncSession, email: str):
     """Get a user by email."""
     statement = select(User).where(User.email == email)
-    return db.exec(statement).first()
+    return (await db.exec(statement)).first()
 
 
-def create_user(db: Session, user: User, hashed_password: str):
+async def create_user(db: AsyncSession, user: User, hashed_password: str):
     """Create a new user."""
     db_user = User(
         email=user.email,
@@ -122,6 +1022,6 @@ def create_user(db: Session, user: User, hashed_password: str):
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
\ No newline at end of file
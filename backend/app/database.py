@@ -1,5 +1,12 @@
-from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.dml import UpdateBase
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from .config import settings
+from .metrics import instrument_engine
 
 # Create engine with the database URL from settings
 # Conditional configuration based on database type
@@ -7,8 +14,7 @@ if settings.DATABASE_URL.startswith("sqlite"):
     # SQLite-specific configuration
     engine = create_engine(
         settings.DATABASE_URL,
-        connect_args={"check_same_thread": False},  # Required for SQLite with FastAPI
-        echo=True  # Enable for debugging in development
+        connect_args={"check_same_thread": False}  # Required for SQLite with FastAPI
     )
 else:
     # PostgreSQL/Neon-specific configuration
@@ -18,15 +24,242 @@ else:
         pool_recycle=300,    # Recycle connections after 5 minutes
         pool_size=20,        # Number of connection objects to keep in the pool
         max_overflow=30,     # Number of connections that can be created beyond pool_size
-        echo=True            # Enable for debugging in development
     )
 
 
-def get_db():
-    with Session(engine) as session:
+def get_async_database_url(url: str):
+    """
+    Translate the configured (sync) DATABASE_URL into its async driver form.
+
+    Returns the async URL plus any connect_args the driver needs. asyncpg does
+    not understand libpq query options such as ``sslmode``, so those are
+    stripped from the URL and mapped onto asyncpg's ``ssl`` argument.
+    """
+    parsed = make_url(url)
+    connect_args = {}
+
+    if parsed.get_backend_name() == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite"), connect_args
+
+    query = dict(parsed.query)
+    sslmode = query.pop("sslmode", None)
+    query.pop("channel_binding", None)
+    if sslmode:
+        connect_args["ssl"] = sslmode  # asyncpg accepts libpq sslmode names
+    return parsed.set(drivername="postgresql+asyncpg", query=query), connect_args
+
+
+# Async engine used by the API request path
+async_url, async_connect_args = get_async_database_url(settings.DATABASE_URL)
+if async_url.get_backend_name() == "sqlite":
+    if async_url.database not in (None, "", ":memory:"):
+        # Keep file connections open (aiosqlite otherwise defaults to NullPool)
+        # so the per-connection pragmas and page cache are reused
+        async_engine = create_async_engine(async_url, poolclass=AsyncAdaptedQueuePool)
+    else:
+        async_engine = create_async_engine(async_url)
+
+    if settings.SQLITE_SINGLE_WRITER and async_url.database not in (None, "", ":memory:"):
+        # SQLite allows one writer at a time; queueing writes on a single
+        # pooled connection replaces lock contention and busy retries
+        async_write_engine = create_async_engine(
+            async_url, poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0
+        )
+    else:
+        async_write_engine = async_engine
+else:
+    async_engine = create_async_engine(
+        async_url,
+        connect_args=async_connect_args,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        pool_size=20,
+        max_overflow=30,
+    )
+    async_write_engine = async_engine
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are switched on
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    if settings.SQLITE_WAL:
+        # Readers no longer block the writer, and commits only fsync at
+        # checkpoints; a power loss can drop the last commits but not corrupt
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
+if settings.DATABASE_URL.startswith("sqlite"):
+    event.listen(engine, "connect", _configure_sqlite_connection)
+    event.listen(async_engine.sync_engine, "connect", _configure_sqlite_connection)
+    if async_write_engine is not async_engine:
+        event.listen(async_write_engine.sync_engine, "connect", _configure_sqlite_connection)
+
+
+# Sync engines by the name used in metrics and readiness reports
+ENGINES = {"sync": engine, "async": async_engine.sync_engine}
+if async_write_engine is not async_engine:
+    ENGINES["async_writer"] = async_write_engine.sync_engine
+
+for name, sync_engine in ENGINES.items():
+    instrument_engine(name, sync_engine)
+
+
+def pool_status() -> dict:
+    """Connection counts of each engine's pool, keyed by engine name."""
+    status = {}
+    for name, sync_engine in ENGINES.items():
+        pool = sync_engine.pool
+        if not hasattr(pool, "checkedout"):
+            continue  # NullPool/StaticPool keep no counts
+        status[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+    return status
+
+
+class WriterRoutingSession(Session):
+    """
+    Session that sends writes to the writer engine and reads to the reader pool.
+
+    Once a transaction has written, the rest of it stays on the writer so it
+    sees its own uncommitted changes. ORM flushes are marked as writes by the
+    before_flush hook below; Core INSERT/UPDATE/DELETE statements by their type.
+    """
+
+    _writing = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if not self._writing and isinstance(clause, UpdateBase):
+            self._writing = True
+        return (async_write_engine if self._writing else async_engine).sync_engine
+
+
+@event.listens_for(WriterRoutingSession, "before_flush")
+def _route_flush_to_writer(session, flush_context, instances):
+    # Runs before the flush asks get_bind for a connection
+    session._writing = True
+
+
+@event.listens_for(WriterRoutingSession, "after_transaction_end")
+def _reset_writer_routing(session, transaction):
+    if transaction.parent is None:
+        session._writing = False
+
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=WriterRoutingSession if async_write_engine is not async_engine else Session,
+    expire_on_commit=False,  # Objects are returned to FastAPI after commit
+)
+
+
+async def get_db():
+    async with AsyncSessionLocal() as session:
         yield session
 
 
-def create_db_and_tables():
+# Text search configuration shared by the index and the queries against it
+SEARCH_CONFIG = "english"
+
+# External-content FTS5 table: the text lives only in tasks, the index is
+# kept in step by triggers
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+# Timestamp columns written by CURRENT_TIMESTAMP before utcnow() replaced it
+SQLITE_TIMESTAMP_COLUMNS = [
+    ("users", "created_at"),
+    ("users", "updated_at"),
+    ("tasks", "created_at"),
+    ("tasks", "updated_at"),
+]
+
+
+def normalize_sqlite_timestamps(connection):
+    """
+    Give second-precision SQLite timestamps the microsecond text format.
+
+    SQLite compares DateTime columns as text, and bound datetimes always
+    render with six fractional digits, so a legacy "YYYY-MM-DD HH:MM:SS"
+    value never equals its own cursor or If-Match version and sorts before
+    later values from the same second. Rewriting the stored text makes both
+    sides use one format. Idempotent; also applied by Alembic revision
+    b8d2e5f1a3c7.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    for table, column in SQLITE_TIMESTAMP_COLUMNS:
+        connection.exec_driver_sql(
+            f"UPDATE {table} SET {column} = {column} || '.000000' WHERE length({column}) = 19"
+        )
+
+
+def create_sqlite_search_index(connection):
+    """
+    Create the FTS5 index over task titles and descriptions on SQLite.
+
+    Idempotent, so it runs on every startup; the FTS table is rebuilt from
+    tasks the first time it is created, covering rows written before the
+    triggers existed. Other dialects are left alone: the PostgreSQL search
+    column and GIN index are schema changes, applied by migration 005 or
+    Alembic revision e4a7b2c9d1f3 rather than on every boot.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    is_new = not inspect(connection).has_table("tasks_fts")
+    for statement in SQLITE_SEARCH_DDL:
+        connection.exec_driver_sql(statement)
+    if is_new:
+        connection.exec_driver_sql("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+async def create_db_and_tables():
     # Create tables using SQLModel metadata
-    SQLModel.metadata.create_all(bind=engine)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(create_sqlite_search_index)
+        await conn.run_sync(normalize_sqlite_timestamps)
+
+
+async def dispose_engines():
+    await async_engine.dispose()
+    if async_write_engine is not async_engine:
+        await async_write_engine.dispose()
+    engine.dispose()
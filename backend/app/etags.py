@@ -0,0 +1,77 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _version(updated_at: Optional[datetime]) -> int:
+    """updated_at as integer microseconds since the epoch; 0 if never set."""
+    if updated_at is None:
+        return 0
+    delta = updated_at - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def task_etag(task_id: int, updated_at: Optional[datetime]) -> str:
+    """
+    Strong ETag of a task: its id and updated_at.
+
+    updated_at changes on every write, and the tag can be turned back into it
+    (parse_task_etags), so If-Match can be checked inside the UPDATE itself.
+    """
+    return f'"{task_id}-{_version(updated_at)}"'
+
+
+def list_etag(user_id: int, version: int, query: Iterable[Tuple[str, str]]) -> str:
+    """
+    Strong ETag of a task list response.
+
+    ``version`` is the user's task version counter, bumped by every create,
+    update or delete of their tasks; the query parameters distinguish pages,
+    filters and field selections.
+    """
+    parts = [str(user_id), str(version)]
+    parts.extend(f"{key}={value}" for key, value in sorted(query))
+    return '"' + hashlib.sha256("&".join(parts).encode()).hexdigest()[:32] + '"'
+
+
+def _split(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison, so W/ tags match too)."""
+    if not if_none_match:
+        return False
+    for tag in _split(if_none_match):
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def parse_task_etags(if_match: Optional[str], task_id: int) -> Optional[List[Optional[datetime]]]:
+    """
+    The updated_at values an If-Match header accepts for task_id.
+
+    Returns None when there is no condition (no header, or "*"), otherwise
+    the list of acceptable versions, None standing for "never updated".
+    Weak and malformed tags, and tags of other tasks, match nothing, so an
+    empty list means the precondition fails.
+    """
+    if not if_match:
+        return None
+    tags = _split(if_match)
+    if "*" in tags:
+        return None
+
+    versions = []
+    for tag in tags:
+        if len(tag) < 2 or not (tag[0] == tag[-1] == '"'):
+            continue  # includes W/ tags, which If-Match never matches
+        tag_id, _, version = tag[1:-1].partition("-")
+        if tag_id != str(task_id) or not version.isdigit():
+            continue
+        micros = int(version)
+        versions.append(_EPOCH + timedelta(microseconds=micros) if micros else None)
+    return versions
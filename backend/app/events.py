@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, Set
+from .config import settings
+from . import schemas
+
+logger = logging.getLogger(__name__)
+
+# Sent to a subscriber whose queue overflowed; the client should re-sync
+# through GET /api/{user_id}/tasks/changes instead of trusting the stream.
+RESYNC_EVENT = {"type": "resync"}
+
+
+def task_event(event_type: str, task) -> dict:
+    """Event payload carrying the full state of a created or updated task."""
+    return {
+        "type": event_type,
+        "task": schemas.Task.model_validate(task).model_dump(mode="json"),
+    }
+
+
+def task_deleted_event(task_id: int) -> dict:
+    return {"type": "task.deleted", "task_id": task_id}
+
+
+class Subscription:
+    """One connected client's bounded queue of pending events."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, event: dict):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A slow consumer loses its backlog rather than growing without
+            # bound; it is told to re-sync instead.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class LocalBroker:
+    """Delivers events only to subscribers connected to this process."""
+
+    async def start(self, deliver: Callable[[int, dict], None], resync: Callable[[], None]):
+        self._deliver = deliver
+
+    async def publish(self, user_id: int, events: List[dict]):
+        for event in events:
+            self._deliver(user_id, event)
+
+    async def stop(self):
+        pass
+
+
+class RedisBroker:
+    """
+    Fans events out across workers through Redis pub/sub.
+
+    Requires the optional ``redis`` package. Every worker publishes to
+    ``tasks:<user_id>`` and listens on ``tasks:*``, delivering what it hears to
+    its own local subscribers. A dropped subscription is re-established with
+    exponential backoff; events published meanwhile are lost, so local
+    subscribers are then told to re-sync.
+    """
+
+    CHANNEL_PREFIX = "tasks:"
+    RECONNECT_INITIAL_SECONDS = 0.5
+    RECONNECT_MAX_SECONDS = 30.0
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("EVENT_BROKER_URL is set but the 'redis' package is not installed")
+        self._client = redis.from_url(url)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Callable[[int, dict], None], resync: Callable[[], None]):
+        self._deliver = deliver
+        self._resync = resync
+        pubsub = await self._subscribe()
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _subscribe(self):
+        pubsub = self._client.pubsub()
+        await pubsub.psubscribe(f"{self.CHANNEL_PREFIX}*")
+        return pubsub
+
+    async def _listen(self, pubsub):
+        delay = self.RECONNECT_INITIAL_SECONDS
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = await self._subscribe()
+                    logger.info("Task event subscription re-established")
+                    delay = self.RECONNECT_INITIAL_SECONDS
+                    self._resync()
+                async for message in pubsub.listen():
+                    self._handle(message)
+                logger.warning("Task event subscription closed; reconnecting in %ss", delay)
+            except Exception:
+                logger.exception("Task event subscription failed; reconnecting in %ss", delay)
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+                pubsub = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_SECONDS)
+
+    def _handle(self, message: dict):
+        if message.get("type") != "pmessage":
+            return
+        channel = message.get("channel")
+        try:
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            user_id = int(channel[len(self.CHANNEL_PREFIX):])
+            events = json.loads(message["data"])
+            if not isinstance(events, list):
+                raise ValueError("expected a list of events")
+            for event in events:
+                self._deliver(user_id, event)
+        except Exception:
+            # One bad message must not stop delivery of the rest
+            logger.exception("Dropped task event message", extra={"channel": channel})
+
+    async def publish(self, user_id: int, events: List[dict]):
+        await self._client.publish(f"{self.CHANNEL_PREFIX}{user_id}", json.dumps(events))
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+        await self._client.aclose()
+
+
+class ChangeFeed:
+    """Per-user publish/subscribe hub for task change events."""
+
+    def __init__(self, broker, queue_size: int):
+        self.broker = broker
+        self.queue_size = queue_size
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+
+    async def start(self):
+        await self.broker.start(self._deliver, self._resync_all)
+
+    async def stop(self):
+        await self.broker.stop()
+
+    def _deliver(self, user_id: int, event: dict):
+        for subscription in self._subscriptions.get(user_id, ()):
+            subscription.put(event)
+
+    def _resync_all(self):
+        for subscribers in self._subscriptions.values():
+            for subscription in subscribers:
+                subscription.put(RESYNC_EVENT)
+
+    async def publish(self, user_id: int, *events: dict):
+        """
+        Send events to the user's subscribers.
+
+        Called after the write has committed, so a broker failure is logged
+        rather than raised: the write succeeded, and subscribers catch up
+        through /tasks/changes.
+        """
+        if not events:
+            return
+        try:
+            await self.broker.publish(user_id, list(events))
+        except Exception:
+            logger.exception("Failed to publish task events", extra={"user_id": user_id})
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int):
+        subscription = Subscription(self.queue_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscriptions.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[user_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscriptions.values())
+
+
+def create_broker():
+    if settings.EVENT_BROKER_URL:
+        return RedisBroker(settings.EVENT_BROKER_URL)
+    return LocalBroker()
+
+
+change_feed = ChangeFeed(create_broker(), queue_size=settings.EVENT_QUEUE_SIZE)
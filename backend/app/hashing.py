@@ -0,0 +1,134 @@
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+from passlib.context import CryptContext
+from .config import settings
+
+# Password hashing context
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHashQueueFull(Exception):
+    """Raised when too many hashing jobs are already waiting for a worker."""
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt work on a dedicated, bounded executor.
+
+    bcrypt is deliberately slow (~250ms per call), so it must never run on the
+    event loop. Keeping it on its own pool means a burst of logins only queues
+    behind other logins instead of starving the default threadpool that the
+    rest of the API relies on.
+
+    Jobs wait in this object's own queue and are handed to the executor only
+    when a worker is free, so ``queued`` and ``running`` (and the
+    ``max_queue`` bound) mean the same for threads and processes, whose
+    workers can't report back when they pick a job up.
+    """
+
+    def __init__(self, kind: str, workers: int, max_queue: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending: deque = deque()
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _submit(self, fn, *args):
+        result = Future()
+        with self._lock:
+            if self.max_queue and len(self._pending) >= self.max_queue and self._running >= self.workers:
+                self._rejected += 1
+                raise PasswordHashQueueFull()
+            self._pending.append((result, fn, args))
+        self._dispatch()
+        return await asyncio.wrap_future(result)
+
+    def _dispatch(self):
+        """Hand waiting jobs to the executor while a worker is free."""
+        while True:
+            with self._lock:
+                if self._running >= self.workers or not self._pending:
+                    return
+                result, fn, args = self._pending.popleft()
+                self._running += 1
+            # False if the caller was cancelled while the job waited
+            if not result.set_running_or_notify_cancel():
+                with self._lock:
+                    self._running -= 1
+                continue
+            job = self._get_executor().submit(fn, *args)
+            job.add_done_callback(partial(self._finished, result))
+
+    def _finished(self, result: Future, job: Future):
+        with self._lock:
+            self._running -= 1
+            if not job.cancelled():
+                self._completed += 1
+        if job.cancelled():
+            result.set_exception(asyncio.CancelledError())
+        elif job.exception() is not None:
+            result.set_exception(job.exception())
+        else:
+            result.set_result(job.result())
+        self._dispatch()
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(_verify, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Current queue depth and throughput counters for the hashing pool."""
+        with self._lock:
+            return {
+                "executor": self.kind,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": len(self._pending),
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            pending, self._pending = self._pending, deque()
+        for result, _, _ in pending:
+            result.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from .config import settings
+from .database import async_engine, pool_status
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessCheck:
+    """
+    Database readiness, cached briefly so frequent probes don't load the DB.
+
+    A check pings the database through the request-path engine, so it fails
+    both when the database is unreachable and when the pool is so exhausted
+    that no connection frees up within the timeout. Concurrent probes share
+    one in-flight check.
+    """
+
+    def __init__(self, timeout_seconds: float, cache_seconds: float):
+        self.timeout_seconds = timeout_seconds
+        self.cache_seconds = cache_seconds
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self.last_error: Optional[dict] = None
+
+    async def check(self) -> dict:
+        if self._is_fresh():
+            return self._result
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._is_fresh():
+                self._result = await self._run()
+                self._checked_at = time.monotonic()
+        return self._result
+
+    def _is_fresh(self) -> bool:
+        return self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds
+
+    async def _ping(self):
+        async with async_engine.connect() as connection:
+            await connection.exec_driver_sql("SELECT 1")
+
+    async def _run(self) -> dict:
+        start = time.perf_counter()
+        ok = True
+        try:
+            await asyncio.wait_for(self._ping(), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            ok = False
+            logger.warning("Readiness check failed: database ping timed out after %ss", self.timeout_seconds)
+        except Exception:
+            ok = False
+            # Driver errors can carry hosts and credentials, so the details
+            # stay in the server log; /ready is unauthenticated
+            logger.exception("Readiness check failed: database ping raised")
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        now = datetime.now(timezone.utc).isoformat()
+
+        if not ok:
+            self.last_error = {"check": "database", "message": "database unavailable", "at": now}
+
+        return {
+            "status": "ready" if ok else "unavailable",
+            "checked_at": now,
+            "database": {"ok": ok, "latency_ms": latency_ms},
+            "pools": pool_status(),
+            "last_error": self.last_error,
+        }
+
+
+readiness = ReadinessCheck(
+    timeout_seconds=settings.READINESS_TIMEOUT_SECONDS,
+    cache_seconds=settings.READINESS_CACHE_SECONDS,
+)
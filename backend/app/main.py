@@ -1,17 +1,35 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import create_db_and_tables
-from .routers import tasks, auth
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
+from .compression import CompressionMiddleware
+from .config import settings
+from .database import create_db_and_tables, dispose_engines
+from .events import change_feed
+from .hashing import password_hasher
+from .health import readiness
+from .log import setup_logging
+from .metrics import MetricsMiddleware, registry
+from .routers import tasks, auth, events
+
+setup_logging()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_db_and_tables()
+    await create_db_and_tables()
+    await change_feed.start()
     yield
+    await change_feed.stop()
+    password_hasher.shutdown()
+    await dispose_engines()
 
 
-app = FastAPI(title="Task Manager API - Phase II", lifespan=lifespan)
+app = FastAPI(
+    title="Task Manager API - Phase II",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS Configuration - Allow all origins for now (restrict in production)
 app.add_middleware(
@@ -20,10 +38,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],  # Read by clients for If-Match
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        content_types=settings.COMPRESSION_CONTENT_TYPES,
+    )
+
+if settings.METRICS_ENABLED:
+    # Added last so it is outermost and times the whole request
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(tasks.router, prefix="/api", tags=["tasks"])
+app.include_router(events.router, prefix="/api", tags=["events"])
 
 
 @app.get("/")
@@ -40,4 +71,25 @@ async def api_health_check():
 @app.get("/health")
 async def health_check():
     """Health check endpoint (alternative path)."""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/api/ready")
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe: 200 only if the database answers within the timeout.
+
+    Unlike /health this touches the database, so point the platform's
+    readiness (not liveness) probe here.
+    """
+    result = await readiness.check()
+    status_code = 200 if result["status"] == "ready" else 503
+    return JSONResponse(result, status_code=status_code)
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics in the text exposition format."""
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -0,0 +1,321 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import anyio.to_thread
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Prometheus client library defaults, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (non-cumulative, last is +Inf), sum]
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                entry = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+        lines = self.header()
+        names = self.labelnames + ("le",)
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(names, labels + (_number(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+def gauge_lines(name: str, documentation: str, samples: Iterable[Tuple[dict, float]], kind: str = "gauge"):
+    """Exposition lines for a value read at scrape time."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+    return lines
+
+
+class MetricsRegistry:
+    """Metrics updated as things happen, plus collectors read at scrape time."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status",
+    ["method", "route", "status"],
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method, route template and status",
+    ["method", "route", "status"],
+))
+http_requests_in_progress = registry.register(Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served", ["method"],
+))
+db_pool_connect_seconds = registry.register(Histogram(
+    "db_pool_connect_seconds", "Time spent opening a new database connection for the pool", ["engine"],
+))
+db_pool_checkout_seconds = registry.register(Histogram(
+    "db_pool_checkout_seconds", "Time a connection stays checked out of the pool", ["engine"],
+))
+db_statement_duration_seconds = registry.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time by statement type",
+    ["engine", "operation"],
+))
+db_statement_errors_total = registry.register(Counter(
+    "db_statement_errors_total", "SQL statements that raised an error", ["engine", "operation"],
+))
+
+_UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _route_template(scope) -> str:
+    """The path template of the route that served ``scope``, e.g. /api/{user_id}/tasks."""
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return _UNMATCHED_ROUTE
+    templates = getattr(app.state, "route_templates", None)
+    if templates is None:
+        templates = app.state.route_templates = {
+            getattr(route, "endpoint", None): route.path for route in app.routes
+        }
+    return templates.get(endpoint, _UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency and in-flight requests.
+
+    Routes are labelled by template rather than raw path so label
+    cardinality stays bounded. Written as plain ASGI so streaming responses
+    pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_progress.dec(method)
+            route = _route_template(scope)
+            http_requests_total.inc(method, route, status_code)
+            http_request_duration_seconds.observe(elapsed, method, route, status_code)
+
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+_instrumented_engines: Dict[str, Engine] = {}
+
+
+def instrument_engine(name: str, engine: Engine):
+    """Time statements, new connections and pool checkouts of ``engine`` (a sync Engine)."""
+    if name in _instrumented_engines:
+        return
+    _instrumented_engines[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_statement_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["metrics_statement_start"].pop()
+        db_statement_duration_seconds.observe(time.perf_counter() - start, name, _operation(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        conn = exception_context.connection
+        starts = conn.info.get("metrics_statement_start") if conn is not None else None
+        if starts:
+            starts.pop()
+        statement = exception_context.statement or ""
+        db_statement_errors_total.inc(name, _operation(statement))
+
+    # Pool listeners registered on the engine carry over to the new pool
+    # that engine.dispose() creates. No event fires before a checkout starts
+    # waiting; a saturated pool shows up as checked_out reaching
+    # size + overflow, and the hold time below is what drives it there.
+    @event.listens_for(engine, "do_connect")
+    def _before_connect(dialect, connection_record, cargs, cparams):
+        connection_record.info["metrics_connect_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        start = connection_record.info.pop("metrics_connect_start", None)
+        if start is not None:
+            db_pool_connect_seconds.observe(time.perf_counter() - start, name)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["metrics_checkout_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        start = connection_record.info.pop("metrics_checkout_start", None) if connection_record else None
+        if start is not None:
+            db_pool_checkout_seconds.observe(time.perf_counter() - start, name)
+
+
+def _collect_pools() -> List[str]:
+    from .database import pool_status
+
+    stats = {"size": [], "checked_out": [], "checked_in": [], "overflow": []}
+    for name, pool in pool_status().items():
+        for key, samples in stats.items():
+            samples.append(({"engine": name}, pool[key]))
+    return (
+        gauge_lines("db_pool_size", "Configured pool_size", stats["size"])
+        + gauge_lines("db_pool_checked_out", "Connections currently checked out", stats["checked_out"])
+        + gauge_lines("db_pool_checked_in", "Idle connections held by the pool", stats["checked_in"])
+        + gauge_lines("db_pool_overflow", "Connections open beyond pool_size", stats["overflow"])
+    )
+
+
+def _collect_threadpool() -> List[str]:
+    # Must run on the event loop; /metrics is an async endpoint
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    statistics = limiter.statistics()
+    return (
+        gauge_lines("threadpool_tokens_total", "Worker threads available to run sync code", [({}, limiter.total_tokens)])
+        + gauge_lines("threadpool_tokens_borrowed", "Worker threads currently busy", [({}, limiter.borrowed_tokens)])
+        + gauge_lines("threadpool_tasks_waiting", "Calls queued for a worker thread", [({}, statistics.tasks_waiting)])
+    )
+
+
+def _collect_app() -> List[str]:
+    from .events import change_feed
+    from .hashing import password_hasher
+    from .stats_cache import task_stats_cache
+    from .token_cache import token_cache
+
+    hasher = password_hasher.stats()
+    return (
+        gauge_lines("password_hash_queued", "Password hashing jobs waiting for a worker", [({}, hasher["queued"])])
+        + gauge_lines("password_hash_running", "Password hashing jobs running", [({}, hasher["running"])])
+        + gauge_lines("password_hash_workers", "Password hashing workers", [({}, hasher["workers"])])
+        + gauge_lines("password_hash_completed_total", "Password hashing jobs finished", [({}, hasher["completed"])], "counter")
+        + gauge_lines("password_hash_rejected_total", "Password hashing jobs rejected because the queue was full", [({}, hasher["rejected"])], "counter")
+        + gauge_lines("token_cache_hits_total", "Access token cache hits", [({}, token_cache.hits)], "counter")
+        + gauge_lines("token_cache_misses_total", "Access token cache misses", [({}, token_cache.misses)], "counter")
+        + gauge_lines("task_stats_cache_hits_total", "Task statistics cache hits", [({}, task_stats_cache.hits)], "counter")
+        + gauge_lines("task_stats_cache_misses_total", "Task statistics cache misses", [({}, task_stats_cache.misses)], "counter")
+        + gauge_lines("event_stream_subscribers", "Open live task event streams", [({}, change_feed.subscriber_count())])
+    )
+
+
+registry.add_collector(_collect_pools)
+registry.add_collector(_collect_threadpool)
+registry.add_collector(_collect_app)
@@ -1,8 +1,14 @@
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
-from datetime import datetime
-from sqlalchemy import Column, DateTime, JSON
-from sqlalchemy.sql import func
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, UniqueConstraint, text
+
+
+def utcnow() -> datetime:
+    """Naive UTC timestamp generated in Python rather than by the database."""
+    # SQLite's CURRENT_TIMESTAMP has no fractional seconds, so its values don't
+    # compare equal to bound datetime parameters; keyset cursors rely on that.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class User(SQLModel, table=True):
@@ -14,11 +20,11 @@ class User(SQLModel, table=True):
     hashed_password: str
     created_at: Optional[datetime] = Field(
         default=None,
-        sa_column=Column(DateTime, default=func.now())
+        sa_column=Column(DateTime, default=utcnow)
     )
     updated_at: Optional[datetime] = Field(
         default=None,
-        sa_column=Column(DateTime, default=func.now(), onupdate=func.now())
+        sa_column=Column(DateTime, default=utcnow, onupdate=utcnow)
     )
 
     tasks: List["Task"] = Relationship(back_populates="user")
@@ -26,6 +32,25 @@ class User(SQLModel, table=True):
 
 class Task(SQLModel, table=True):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Every list query is scoped by user_id, so each index leads with it
+        Index("ix_tasks_user_id_created_at", "user_id", "created_at"),
+        Index("ix_tasks_user_id_completed_due_date", "user_id", "completed", "due_date"),
+        Index("ix_tasks_user_id_due_date", "user_id", "due_date"),
+        # Equality filters followed by the default sort, so a filtered page
+        # is read in order without sorting
+        Index("ix_tasks_user_id_priority_created_at", "user_id", "priority", "created_at"),
+        Index("ix_tasks_user_id_starred_created_at", "user_id", "starred", "created_at"),
+        Index("ix_tasks_user_id_updated_at", "user_id", "updated_at"),
+        # Delta sync reads a user's changes in (change_seq, id) order
+        Index("ix_tasks_user_id_change_seq", "user_id", "change_seq", "id"),
+        # Open tasks only: the default "active" view, newest first
+        Index(
+            "ix_tasks_open_user_id_created_at", "user_id", "created_at",
+            postgresql_where=text("NOT completed"),
+            sqlite_where=text("completed = 0"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
     title: str = Field(max_length=255)
@@ -36,21 +61,82 @@ class Task(SQLModel, table=True):
     # Enhanced fields for Phase 2
     priority: str = Field(default="medium", max_length=10)  # low, medium, high
     starred: bool = Field(default=False)
-    tags: Optional[str] = Field(default=None, sa_column=Column(JSON))  # JSON array of tags
+    # Denormalised copy of the task's tag names for reads; filtering and
+    # counting go through the indexed tags/task_tags tables instead
+    tags: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
     due_date: Optional[datetime] = Field(default=None, sa_column=Column(DateTime))
 
     created_at: Optional[datetime] = Field(
         default=None,
-        sa_column=Column(DateTime, default=func.now())
+        sa_column=Column(DateTime, default=utcnow)
     )
     updated_at: Optional[datetime] = Field(
         default=None,
-        sa_column=Column(DateTime, default=func.now(), onupdate=func.now())
+        sa_column=Column(DateTime, default=utcnow, onupdate=utcnow)
     )
+    # TaskVersion.version of the transaction that last wrote the task
+    change_seq: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
     user: Optional[User] = Relationship(back_populates="tasks")
 
 
+class Tag(SQLModel, table=True):
+    """A user's tag name; each distinct name is stored once per user."""
+    __tablename__ = "tags"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_tags_user_id_name"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    name: str = Field(max_length=255)
+
+
+class TaskTag(SQLModel, table=True):
+    """Link between a task and one of its tags."""
+    __tablename__ = "task_tags"
+
+    task_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    )
+    tag_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True, index=True)
+    )
+
+
+class TaskDeletion(SQLModel, table=True):
+    """Tombstone recorded for each deleted task so clients can sync deletes."""
+    __tablename__ = "task_deletions"
+    __table_args__ = (
+        Index("ix_task_deletions_user_id_change_seq", "user_id", "change_seq", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    task_id: int
+    user_id: int = Field(foreign_key="users.id")
+    deleted_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime, default=utcnow)
+    )
+    change_seq: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
+
+class TaskVersion(SQLModel, table=True):
+    """
+    Per-user change counter, bumped first in every transaction that writes
+    the user's tasks.
+
+    The row stays locked until commit, so a user's writes are numbered in
+    commit order; tasks and tombstones carry the number as change_seq.
+    """
+    __tablename__ = "task_versions"
+
+    user_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    )
+    version: int = Field(default=0)
+
+
 class TaskCreate(SQLModel):
     title: str
     description: Optional[str] = None
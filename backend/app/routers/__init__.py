@@ -1,3 +1,3 @@
-from . import tasks, auth
+from . import tasks, auth, events
 
-__all__ = ["tasks", "auth"]
+__all__ = ["tasks", "auth", "events"]
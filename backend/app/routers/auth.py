@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, EmailStr
 from datetime import timedelta
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..auth import create_access_token, authenticate_user, get_current_user, get_password_hash
 from ..config import settings
 from ..database import get_db
@@ -35,12 +35,12 @@ class UserResponse(BaseModel):
 
 
 @router.post("/register", response_model=TokenResponse)
-async def register(request: RegisterRequest, db: Session = Depends(get_db)):
+async def register(request: RegisterRequest, db: AsyncSession = Depends(get_db)):
     """
     Register a new user and return access token.
     """
     # Check if user already exists
-    existing_user = get_user_by_email(db, request.email)
+    existing_user = await get_user_by_email(db, request.email)
     if existing_user:
         raise HTTPException(
             status_code=400,
@@ -48,15 +48,15 @@ async def register(request: RegisterRequest, db: Session = Depends(get_db)):
         )
 
     # Create new user
-    hashed_password = get_password_hash(request.password)
+    hashed_password = await get_password_hash(request.password)
     new_user = User(
         email=request.email,
         name=request.name,
         hashed_password=hashed_password
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     # Create access token (sub must be string per JWT spec)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -77,12 +77,12 @@ async def register(request: RegisterRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
     """
     Authenticate user and return access token.
     Verifies credentials against the database.
     """
-    user = authenticate_user(db, request.email, request.password)
+    user = await authenticate_user(db, request.email, request.password)
     if not user:
         raise HTTPException(
             status_code=401,
@@ -110,13 +110,13 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
 @router.get("/me")
 async def get_current_user_info(
     current_user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get current user information based on the JWT token.
     """
     from ..crud import get_user
-    user = get_user(db, current_user_id)
+    user = await get_user(db, current_user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return {
@@ -129,7 +129,7 @@ async def get_current_user_info(
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
     current_user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Refresh access token.
@@ -137,7 +137,7 @@ async def refresh_token(
     """
     from ..crud import get_user
 
-    user = get_user(db, current_user_id)
+    user = await get_user(db, current_user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
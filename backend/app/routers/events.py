@@ -0,0 +1,97 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional
+from .. import schemas
+from ..auth import create_stream_ticket, decode_stream_ticket, get_current_user, get_user_id_for_token
+from ..config import settings
+from ..database import get_db
+from ..events import change_feed
+from ..models import User
+
+router = APIRouter()
+
+# EventSource can't set headers, so it authenticates with a stream ticket
+# in the query string; access tokens are only accepted as a bearer header
+optional_security = HTTPBearer(auto_error=False)
+
+
+async def get_stream_user(
+    ticket: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_db)
+):
+    """Authenticate a streaming client by bearer header or ticket query param."""
+    if credentials:
+        return await get_user_id_for_token(credentials.credentials, db)
+    if not ticket:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
+    user_id = decode_stream_ticket(ticket)
+    if await db.get(User, user_id) is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid ticket")
+    return user_id
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.post("/{user_id}/events/ticket", response_model=schemas.StreamTicket)
+async def create_event_ticket(
+    user_id: int,
+    current_user_id: int = Depends(get_current_user)
+):
+    """Issue a short-lived ticket for opening the user's event stream."""
+    # Verify that the requested user_id matches the authenticated user
+    if user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access these events"
+        )
+    return {"ticket": create_stream_ticket(user_id), "expires_in": settings.EVENT_TICKET_EXPIRE_SECONDS}
+
+
+@router.get("/{user_id}/events")
+async def task_events(
+    user_id: int,
+    request: Request,
+    current_user_id: int = Depends(get_stream_user)
+):
+    """
+    Server-Sent Events stream of the user's task changes.
+
+    Emits task.created, task.updated and task.deleted events as they happen
+    in any tab or device, plus a resync event if this connection fell too far
+    behind (the client should then catch up through /tasks/changes).
+    """
+    # Verify that the requested user_id matches the authenticated user
+    if user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access these events"
+        )
+
+    async def stream():
+        async with change_feed.subscribe(user_id) as subscription:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), timeout=settings.EVENT_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,23 +1,182 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from .. import crud, models, schemas
-from ..database import get_db
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+import csv
+import io
+import orjson
+from .. import crud, etags, models, schemas
+from ..config import settings
+from ..database import AsyncSessionLocal, get_db
 from ..auth import get_current_user
 
 router = APIRouter()
 
+# Upper bound on explicit id lists accepted by the bulk endpoints
+MAX_BULK_IDS = 1000
 
-@router.get("/{user_id}/tasks", response_model=List[schemas.Task])
-def read_tasks(
+# Responses may be cached, but only by the user's client and only after
+# revalidating with If-None-Match
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """crud.parse_task_fields, reporting unknown names as 400."""
+    try:
+        return crud.parse_task_fields(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+    )
+
+
+def precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Task has been modified since it was fetched"
+    )
+
+
+def validate_task_filter(task_status: Optional[str], priority: Optional[str]):
+    """Reject unknown status/priority values in list and bulk filters."""
+    if task_status and task_status not in crud.TASK_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Status must be all, active, or completed"
+        )
+
+    if priority and priority not in crud.TASK_PRIORITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Priority must be low, medium, or high"
+        )
+
+
+def validate_task_create(task: schemas.TaskCreate):
+    """Validate a new task's fields."""
+    # Validate title length
+    if len(task.title) < 1 or len(task.title) > 255:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Title must be between 1 and 255 characters"
+        )
+
+    # Validate description length
+    if task.description and len(task.description) > 1000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Description must be 1000 characters or less"
+        )
+
+    # Validate priority
+    if task.priority and task.priority not in ["low", "medium", "high"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Priority must be low, medium, or high"
+        )
+
+    # Validate tags length
+    if task.tags and len(task.tags) > 10:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maximum 10 tags allowed"
+        )
+
+
+def validate_task_update(task_update: schemas.TaskUpdate):
+    """Validate the fields that are set on a task update."""
+    # Validate title length if provided
+    if task_update.title is not None:
+        if len(task_update.title) < 1 or len(task_update.title) > 255:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Title must be between 1 and 255 characters"
+            )
+
+    # Validate description length if provided
+    if task_update.description is not None and len(task_update.description) > 1000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Description must be 1000 characters or less"
+        )
+
+    # Validate priority if provided
+    if task_update.priority and task_update.priority not in ["low", "medium", "high"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Priority must be low, medium, or high"
+        )
+
+    # Validate tags length if provided
+    if task_update.tags and len(task_update.tags) > 10:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maximum 10 tags allowed"
+        )
+
+
+def validate_bulk_selection(ids: Optional[List[int]], task_filter: Optional[schemas.TaskFilter]):
+    """A bulk request must say which tasks it targets, by ids and/or filter."""
+    if ids is None and task_filter is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide ids, a filter, or both"
+        )
+
+    if ids is not None and len(ids) > MAX_BULK_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximum {MAX_BULK_IDS} ids allowed"
+        )
+
+    if task_filter is not None:
+        validate_task_filter(task_filter.status, task_filter.priority)
+
+
+@router.get("/{user_id}/tasks", response_model=schemas.TaskPage)
+async def read_tasks(
+    request: Request,
     user_id: int,
     current_user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    task_status: Optional[str] = Query(None, alias="status"),
+    starred: Optional[bool] = None,
+    priority: Optional[str] = None,
+    tag: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    q: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """
-    Get all tasks for the authenticated user.
+    Get a page of tasks for the authenticated user.
+
+    Supports filtering by status (all/active/completed), starred, priority,
+    tag, due-date range and a text query over title and description, plus
+    sorting by created_at, updated_at, due_date, title or priority.
+    Pass the returned next_cursor back as cursor to fetch the following page.
+    fields (comma-separated, e.g. "title,completed") limits each task to
+    those fields plus id.
+
+    Rows come straight from the database already shaped like schemas.Task,
+    so the page is encoded without response_model validation.
+
+    The ETag covers the user's task count, latest update and the query, so
+    a matching If-None-Match gets a 304 without the page being read.
     """
     # Verify that the requested user_id matches the authenticated user
     if user_id != current_user_id:
@@ -26,137 +185,467 @@ def read_tasks(
             detail="Not authorized to access these tasks"
         )
 
-    tasks = crud.get_tasks(db, user_id=user_id, skip=skip, limit=limit)
-    return tasks
+    validate_task_filter(task_status, priority)
 
+    if sort not in crud.TASK_SORT_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sort must be one of: " + ", ".join(crud.TASK_SORT_KEYS)
+        )
 
-@router.get("/{user_id}/tasks/{task_id}", response_model=schemas.Task)
-def read_task(
+    if order not in crud.SORT_ORDERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Order must be asc or desc"
+        )
+
+    selected = parse_fields(fields)
+
+    version = await crud.get_task_list_version(db, user_id)
+    etag = etags.list_etag(user_id, version, request.query_params.multi_items())
+    if etags.etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    try:
+        tasks, next_cursor = await crud.get_task_rows(
+            db,
+            user_id=user_id,
+            cursor=cursor,
+            limit=limit,
+            fields=selected,
+            status=task_status,
+            starred=starred,
+            priority=priority,
+            tag=tag,
+            due_after=due_after,
+            due_before=due_before,
+            q=q,
+            sort=sort,
+            order=order
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return ORJSONResponse(
+        {"items": tasks, "next_cursor": next_cursor},
+        headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+    )
+
+
+@router.get("/{user_id}/tasks/changes", response_model=schemas.TaskChanges)
+async def read_task_changes(
     user_id: int,
-    task_id: int,
     current_user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    since: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=5000)
 ):
     """
-    Get a specific task by ID.
+    Get the tasks created or updated, and the ids of tasks deleted, since a
+    watermark.
+
+    Omit since to start from the beginning. Pass the returned watermark as
+    since on the next call; poll again immediately while has_more is true.
     """
     # Verify that the requested user_id matches the authenticated user
     if user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this task"
+            detail="Not authorized to access these tasks"
         )
 
-    db_task = crud.get_task(db, task_id=task_id, user_id=user_id)
-    if db_task is None:
+    try:
+        tasks, deleted_ids, watermark, has_more = await crud.get_task_changes(
+            db, user_id=user_id, since=since, limit=limit
+        )
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-    return db_task
 
+    return {
+        "tasks": tasks,
+        "deleted_ids": deleted_ids,
+        "watermark": watermark,
+        "has_more": has_more
+    }
 
-@router.post("/{user_id}/tasks", response_model=schemas.Task, status_code=status.HTTP_201_CREATED)
-def create_task(
+
+@router.get("/{user_id}/tasks/stats", response_model=schemas.TaskStats)
+async def read_task_stats(
     user_id: int,
-    task: schemas.TaskCreate,
     current_user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Create a new task for the authenticated user.
+    Get completion, starred, priority and overdue counts for the user's tasks.
     """
     # Verify that the requested user_id matches the authenticated user
     if user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to create tasks for this user"
+            detail="Not authorized to access these tasks"
         )
 
-    # Validate title length
-    if len(task.title) < 1 or len(task.title) > 255:
+    return await crud.get_task_stats(db, user_id=user_id)
+
+
+@router.get("/{user_id}/tasks/search", response_model=List[schemas.TaskSearchHit])
+async def search_tasks(
+    user_id: int,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    current_user_id: int = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Full-text search of the user's task titles and descriptions, best
+    matches first, with matched words highlighted.
+    """
+    # Verify that the requested user_id matches the authenticated user
+    if user_id != current_user_id:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Title must be between 1 and 255 characters"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access these tasks"
         )
 
-    # Validate description length
-    if task.description and len(task.description) > 1000:
+    try:
+        return await crud.search_tasks(db, user_id=user_id, q=q, limit=limit)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Description must be 1000 characters or less"
+            detail=str(e)
         )
 
-    # Validate priority
-    if task.priority and task.priority not in ["low", "medium", "high"]:
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Leading characters that make spreadsheet apps treat a CSV cell as a formula
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        value = ",".join(value)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+async def export_chunks(user_id: int, export_format: str, names: List[str], filters: dict):
+    """Encoded chunks of a task export, one per database batch."""
+    # The request's session is closed once the endpoint returns, before the
+    # body is streamed, so the export reads through its own
+    async with AsyncSessionLocal() as db:
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(names)
+        async for tasks in crud.stream_task_rows(
+            db, user_id, fields=names, batch_size=settings.EXPORT_BATCH_SIZE, **filters
+        ):
+            if export_format == "ndjson":
+                yield b"".join(orjson.dumps(task) + b"\n" for task in tasks)
+            else:
+                writer.writerows([_csv_cell(task[name]) for name in names] for task in tasks)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        if export_format == "csv" and buffer.tell():
+            yield buffer.getvalue().encode()  # Header of an empty export
+
+
+@router.get("/{user_id}/tasks/export")
+async def export_tasks(
+    user_id: int,
+    current_user_id: int = Depends(get_current_user),
+    export_format: str = Query("ndjson", alias="format"),
+    task_status: Optional[str] = Query(None, alias="status"),
+    starred: Optional[bool] = None,
+    priority: Optional[str] = None,
+    tag: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """
+    Download all of the user's tasks, oldest first, as NDJSON (one JSON
+    object per line) or CSV.
+
+    Accepts the status, starred, priority, tag and fields parameters of the
+    task list. Rows are streamed from a database cursor as they are read, so
+    any number of tasks can be exported.
+    """
+    # Verify that the requested user_id matches the authenticated user
+    if user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access these tasks"
+        )
+
+    if export_format not in EXPORT_MEDIA_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Priority must be low, medium, or high"
+            detail="Format must be ndjson or csv"
         )
 
-    # Validate tags length
-    if task.tags and len(task.tags) > 10:
+    validate_task_filter(task_status, priority)
+    names = parse_fields(fields) or list(crud.TASK_FIELDS)
+    filters = {"status": task_status, "starred": starred, "priority": priority, "tag": tag}
+
+    return StreamingResponse(
+        export_chunks(user_id, export_format, names, filters),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks-{user_id}.{export_format}"',
+            "Cache-Control": "no-store",
+        }
+    )
+
+
+@router.get("/{user_id}/tags", response_model=List[schemas.TagCount])
+async def read_tag_counts(
+    user_id: int,
+    current_user_id: int = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get each of the user's tags with the number of tasks using it.
+    """
+    # Verify that the requested user_id matches the authenticated user
+    if user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access these tasks"
+        )
+
+    return await crud.get_tag_counts(db, user_id=user_id)
+
+
+@router.post("/{user_id}/tasks/bulk/update", response_model=schemas.TaskBulkResult)
+async def bulk_update_tasks(
+    user_id: int,
+    request: schemas.TaskBulkUpdate,
+    current_user_id: int = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Apply the same changes to many tasks at once.
+
+    Tasks are selected by an id list, a filter (same fields as the list
+    endpoint), or both. Runs as a single UPDATE in one transaction.
+    """
+    # Verify that the requested user_id matches the authenticated user
+    if user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update these tasks"
+        )
+
+    validate_bulk_selection(request.ids, request.filter)
+    validate_task_update(request.changes)
+
+    if not request.changes.model_dump(exclude_none=True):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Maximum 10 tags allowed"
+            detail="No changes provided"
         )
 
-    return crud.create_task(db=db, task=task, user_id=user_id)
+    affected_ids = await crud.bulk_update_tasks(
+        db=db,
+        user_id=user_id,
+        task_update=request.changes,
+        ids=request.ids,
+        filters=request.filter.model_dump() if request.filter else None
+    )
+    return {"affected_ids": affected_ids}
 
 
-@router.put("/{user_id}/tasks/{task_id}", response_model=schemas.Task)
-def update_task(
+@router.post("/{user_id}/tasks/bulk/delete", response_model=schemas.TaskBulkResult)
+async def bulk_delete_tasks(
+    user_id: int,
+    request: schemas.TaskBulkDelete,
+    current_user_id: int = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete many tasks at once.
+
+    Tasks are selected by an id list, a filter (same fields as the list
+    endpoint), or both. Runs as a single DELETE in one transaction.
+    """
+    # Verify that the requested user_id matches the authenticated user
+    if user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to delete these tasks"
+        )
+
+    validate_bulk_selection(request.ids, request.filter)
+
+    affected_ids = await crud.bulk_delete_tasks(
+        db=db,
+        user_id=user_id,
+        ids=request.ids,
+        filters=request.filter.model_dump() if request.filter else None
+    )
+    return {"affected_ids": affected_ids}
+
+
+@router.get("/{user_id}/tasks/{task_id}", response_model=schemas.Task)
+async def read_task(
     user_id: int,
     task_id: int,
-    task_update: schemas.TaskUpdate,
     current_user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """
-    Update a specific task for the authenticated user.
+    Get a specific task by ID.
+
+    fields (comma-separated) limits the task to those fields plus id. The
+    ETag is the task's version; send it back as If-None-Match to get a 304
+    while the task is unchanged, or as If-Match on writes.
     """
     # Verify that the requested user_id matches the authenticated user
     if user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this task"
+            detail="Not authorized to access this task"
         )
 
-    # Validate title length if provided
-    if task_update.title is not None:
-        if len(task_update.title) < 1 or len(task_update.title) > 255:
+    selected = parse_fields(fields)
+
+    # Revalidation probes the version alone, so an unchanged task is never
+    # loaded; a plain read gets the version with the row in one query
+    if if_none_match:
+        version = await crud.get_task_version(db, task_id=task_id, user_id=user_id)
+        if version is None:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Title must be between 1 and 255 characters"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
             )
+        etag = etags.task_etag(task_id, version.updated_at)
+        if etags.etag_matches(if_none_match, etag):
+            return not_modified(etag)
 
-    # Validate description length if provided
-    if task_update.description is not None and len(task_update.description) > 1000:
+    found = await crud.get_task_row(db, task_id=task_id, user_id=user_id, fields=selected)
+    if found is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Description must be 1000 characters or less"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
         )
+    task, updated_at = found
+    etag = etags.task_etag(task_id, updated_at)
+    return ORJSONResponse(task, headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL})
 
-    # Validate priority if provided
-    if task_update.priority and task_update.priority not in ["low", "medium", "high"]:
+
+@router.post("/{user_id}/tasks", response_model=schemas.Task, status_code=status.HTTP_201_CREATED)
+async def create_task(
+    user_id: int,
+    task: schemas.TaskCreate,
+    response: Response,
+    current_user_id: int = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create a new task for the authenticated user.
+    """
+    # Verify that the requested user_id matches the authenticated user
+    if user_id != current_user_id:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Priority must be low, medium, or high"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to create tasks for this user"
         )
 
-    # Validate tags length if provided
-    if task_update.tags and len(task_update.tags) > 10:
+    validate_task_create(task)
+
+    db_task = await crud.create_task(db=db, task=task, user_id=user_id)
+    response.headers["ETag"] = etags.task_etag(db_task.id, db_task.updated_at)
+    return db_task
+
+
+@router.post("/{user_id}/tasks/batch", response_model=List[schemas.Task], status_code=status.HTTP_201_CREATED)
+async def create_tasks(
+    user_id: int,
+    batch: schemas.TaskBatchCreate,
+    current_user_id: int = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many tasks for the authenticated user in one request.
+
+    Every task is validated before anything is written; the batch is then
+    inserted in a single transaction and returned in request order.
+    """
+    # Verify that the requested user_id matches the authenticated user
+    if user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to create tasks for this user"
+        )
+
+    if len(batch.tasks) > settings.TASK_BATCH_MAX_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Maximum 10 tags allowed"
+            detail=f"Maximum {settings.TASK_BATCH_MAX_SIZE} tasks per batch"
         )
 
-    db_task = crud.update_task(
-        db=db,
-        task_id=task_id,
-        task_update=task_update,
-        user_id=user_id
-    )
+    for index, task in enumerate(batch.tasks):
+        try:
+            validate_task_create(task)
+        except HTTPException as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=f"Task {index}: {e.detail}"
+            )
+
+    return await crud.create_tasks(db=db, tasks=batch.tasks, user_id=user_id)
+
+
+@router.put("/{user_id}/tasks/{task_id}", response_model=schemas.Task)
+async def update_task(
+    user_id: int,
+    task_id: int,
+    task_update: schemas.TaskUpdate,
+    response: Response,
+    current_user_id: int = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Update a specific task for the authenticated user.
+
+    With If-Match, the update only applies if the task still has that ETag;
+    otherwise 412 Precondition Failed.
+    """
+    # Verify that the requested user_id matches the authenticated user
+    if user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this task"
+        )
+
+    validate_task_update(task_update)
+
+    try:
+        db_task = await crud.update_task(
+            db=db,
+            task_id=task_id,
+            task_update=task_update,
+            user_id=user_id,
+            expected_versions=etags.parse_task_etags(if_match, task_id)
+        )
+    except crud.PreconditionFailed:
+        raise precondition_failed()
 
     if db_task is None:
         raise HTTPException(
@@ -164,19 +653,24 @@ def update_task(
             detail="Task not found"
         )
 
+    response.headers["ETag"] = etags.task_etag(db_task.id, db_task.updated_at)
     return db_task
 
 
 @router.patch("/{user_id}/tasks/{task_id}/complete", response_model=schemas.Task)
-def update_task_completion(
+async def update_task_completion(
     user_id: int,
     task_id: int,
     task_update: schemas.TaskUpdate,
+    response: Response,
     current_user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    if_match: Optional[str] = Header(None)
 ):
     """
     Update a specific task's completion status for the authenticated user.
+
+    Honours If-Match like the full update.
     """
     # Verify that the requested user_id matches the authenticated user
     if user_id != current_user_id:
@@ -192,12 +686,16 @@ def update_task_completion(
             detail="Completed field is required"
         )
 
-    db_task = crud.update_task(
-        db=db,
-        task_id=task_id,
-        task_update=task_update,
-        user_id=user_id
-    )
+    try:
+        db_task = await crud.update_task(
+            db=db,
+            task_id=task_id,
+            task_update=task_update,
+            user_id=user_id,
+            expected_versions=etags.parse_task_etags(if_match, task_id)
+        )
+    except crud.PreconditionFailed:
+        raise precondition_failed()
 
     if db_task is None:
         raise HTTPException(
@@ -205,18 +703,22 @@ def update_task_completion(
             detail="Task not found"
         )
 
+    response.headers["ETag"] = etags.task_etag(db_task.id, db_task.updated_at)
     return db_task
 
 
 @router.delete("/{user_id}/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     user_id: int,
     task_id: int,
     current_user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    if_match: Optional[str] = Header(None)
 ):
     """
     Delete a specific task for the authenticated user.
+
+    With If-Match, only deletes the task if it still has that ETag.
     """
     # Verify that the requested user_id matches the authenticated user
     if user_id != current_user_id:
@@ -225,7 +727,15 @@ def delete_task(
             detail="Not authorized to delete this task"
         )
 
-    success = crud.delete_task(db=db, task_id=task_id, user_id=user_id)
+    try:
+        success = await crud.delete_task(
+            db=db,
+            task_id=task_id,
+            user_id=user_id,
+            expected_versions=etags.parse_task_etags(if_match, task_id)
+        )
+    except crud.PreconditionFailed:
+        raise precondition_failed()
 
     if not success:
         raise HTTPException(
@@ -46,6 +46,77 @@ class Task(BaseModel):
         from_attributes = True
 
 
+class TaskBatchCreate(BaseModel):
+    tasks: List[TaskCreate]
+
+
+class TaskFilter(BaseModel):
+    status: Optional[str] = None
+    starred: Optional[bool] = None
+    priority: Optional[str] = None
+    tag: Optional[str] = None
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+    q: Optional[str] = None
+
+
+class TaskBulkDelete(BaseModel):
+    ids: Optional[List[int]] = None
+    filter: Optional[TaskFilter] = None
+
+
+class TaskBulkUpdate(BaseModel):
+    ids: Optional[List[int]] = None
+    filter: Optional[TaskFilter] = None
+    changes: TaskUpdate
+
+
+class TaskBulkResult(BaseModel):
+    affected_ids: List[int]
+
+
+class TaskChanges(BaseModel):
+    tasks: List[Task]
+    deleted_ids: List[int]
+    watermark: str
+    has_more: bool = False
+
+
+class TaskPage(BaseModel):
+    items: List[Task]
+    next_cursor: Optional[str] = None
+
+
+class TaskSearchHit(BaseModel):
+    task: Task
+    rank: float
+    title_highlight: Optional[str] = None
+    description_highlight: Optional[str] = None
+
+
+class TaskStats(BaseModel):
+    total: int
+    completed: int
+    active: int
+    completion_rate: int
+    starred: int
+    high_priority: int
+    medium_priority: int
+    low_priority: int
+    overdue: int
+    productivity_score: int
+
+
+class TagCount(BaseModel):
+    name: str
+    count: int
+
+
+class StreamTicket(BaseModel):
+    ticket: str
+    expires_in: int
+
+
 class UserCreate(BaseModel):
     email: str
     name: str
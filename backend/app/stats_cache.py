@@ -0,0 +1,58 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from .config import settings
+
+
+class TaskStatsCache:
+    """
+    Size-bounded LRU of per-user task statistics.
+
+    Each entry is stored with the user's persisted TaskVersion counter and
+    only served while the caller's freshly read counter still matches, so a
+    write from any worker, or from a script that bumps the counter, misses
+    every worker's cache. The TTL bounds time-dependent counts (overdue).
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, version: int) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            stats, cached_version, expires_at = entry
+            if cached_version != version or expires_at <= time.time():
+                del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return stats
+
+    def set(self, user_id: int, stats: dict, version: int):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (stats, version, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+task_stats_cache = TaskStatsCache(
+    maxsize=settings.TASK_STATS_CACHE_SIZE,
+    ttl_seconds=settings.TASK_STATS_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+from sqlalchemy import event
+from .config import settings
+from .models import User
+
+
+class TokenCache:
+    """
+    Size-bounded LRU of verified access tokens -> user_id.
+
+    An entry lives until the earlier of the token's own ``exp`` and the
+    configured TTL, so a cached token can never outlive its signature. The
+    TTL bounds how long a token keeps working after its user disappears
+    without going through the ORM (e.g. a manual DELETE in the database).
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            user_id, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user_id
+
+    def set(self, token: str, user_id: int, token_exp: float):
+        if self.maxsize <= 0:
+            return
+        expires_at = min(token_exp, time.time() + self.ttl_seconds)
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (user_id, expires_at)
+            self._tokens_by_user.setdefault(user_id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached token that belongs to ``user_id``."""
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, token: str):
+        user_id, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+
+token_cache = TokenCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_deleted_user(mapper, connection, target):
+    token_cache.invalidate_user(target.id)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Task Tag Backfill
+Rebuild the tags/task_tags tables from tasks.tags on any database
+
+Migration 004 does this in SQL on PostgreSQL only; this script covers
+SQLite and any rows written before the tables existed. Each task's tags are
+normalized the way the API writes them (stripped, no blanks or repeats,
+first-seen order): lists stored as a JSON-encoded string are unwrapped,
+tasks.tags is rewritten where it differed, and the task's task_tags rows
+are replaced. Every user in a batch gets their TaskVersion counter bumped,
+and rewritten tasks take the new change_seq and a fresh updated_at, so list
+and task ETags, cached stats and delta sync all see the change. Idempotent;
+run it while the API is stopped.
+
+Example:
+    python backfill_task_tags.py --batch-size 5000
+"""
+
+import argparse
+import json
+import sys
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import SQLModel
+from app.crud import normalize_tags
+from app.database import engine
+from app.models import Tag, Task, TaskTag, TaskVersion, utcnow
+
+
+def stored_tags(value) -> list:
+    """tasks.tags as a list, unwrapping lists stored as a JSON-encoded string."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return value if isinstance(value, list) else []
+
+
+def tag_ids_for(conn, names_by_user: dict) -> dict:
+    """(user_id, name) -> tag id, creating the tags that don't exist yet."""
+    wanted = {(user_id, name) for user_id, names in names_by_user.items() for name in names}
+    if not wanted:
+        return {}
+
+    def existing():
+        statement = select(Tag.user_id, Tag.name, Tag.id).where(Tag.user_id.in_(list(names_by_user)))
+        return {(user_id, name): tag_id for user_id, name, tag_id in conn.execute(statement)
+                if (user_id, name) in wanted}
+
+    tag_ids = existing()
+    missing = wanted - tag_ids.keys()
+    if missing:
+        conn.execute(insert(Tag), [{"user_id": user_id, "name": name} for user_id, name in sorted(missing)])
+        tag_ids = existing()
+    return tag_ids
+
+
+def next_change_seq(conn, user_id: int) -> int:
+    """Bump the user's TaskVersion counter and return it, as crud._next_change_seq does."""
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = (
+            dialect_insert(TaskVersion)
+            .values(user_id=user_id, version=1)
+            .on_conflict_do_update(index_elements=["user_id"], set_={"version": TaskVersion.version + 1})
+            .returning(TaskVersion.version)
+        )
+        return conn.execute(statement).scalar_one()
+
+    version = conn.execute(
+        select(TaskVersion.version).where(TaskVersion.user_id == user_id).with_for_update()
+    ).scalar()
+    if version is None:
+        conn.execute(insert(TaskVersion).values(user_id=user_id, version=1))
+        return 1
+    conn.execute(update(TaskVersion).where(TaskVersion.user_id == user_id).values(version=version + 1))
+    return version + 1
+
+
+def backfill_batch(conn, rows) -> int:
+    """Normalize and link one batch of (id, user_id, tags) rows; returns how many tasks were rewritten."""
+    tags_by_task, names_by_user, changed = {}, {}, []
+    for task_id, user_id, raw in rows:
+        tags = normalize_tags([name for name in stored_tags(raw) if isinstance(name, str)])
+        if (tags or None) != raw:
+            changed.append((task_id, user_id, tags))
+        tags_by_task[(task_id, user_id)] = tags
+        names_by_user.setdefault(user_id, set()).update(tags)
+
+    # Counters first and in a fixed order, as the API's write paths do
+    change_seqs = {user_id: next_change_seq(conn, user_id) for user_id in sorted(names_by_user)}
+    now = utcnow()
+    for task_id, user_id, tags in changed:
+        conn.execute(
+            update(Task).where(Task.id == task_id)
+            .values(tags=tags or None, updated_at=now, change_seq=change_seqs[user_id])
+        )
+
+    tag_ids = tag_ids_for(conn, names_by_user)
+    conn.execute(delete(TaskTag).where(TaskTag.task_id.in_([task_id for task_id, _ in tags_by_task])))
+    links = [
+        {"task_id": task_id, "tag_id": tag_ids[(user_id, name)]}
+        for (task_id, user_id), tags in tags_by_task.items()
+        for name in tags
+    ]
+    if links:
+        conn.execute(insert(TaskTag), links)
+    return len(changed)
+
+
+def backfill(batch_size: int):
+    with engine.begin() as conn:
+        SQLModel.metadata.create_all(conn, tables=[Tag.__table__, TaskTag.__table__])
+
+    last_id, tasks, rewritten = 0, 0, 0
+    while True:
+        # One transaction per batch, walking the primary key
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(Task.id, Task.user_id, Task.tags)
+                .where(Task.id > last_id)
+                .order_by(Task.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            rewritten += backfill_batch(conn, rows)
+        last_id = rows[-1][0]
+        tasks += len(rows)
+        print(f"  {tasks} tasks processed")
+
+    print(f"\nBackfilled tags for {tasks} tasks ({rewritten} tasks.tags values normalized)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild tags/task_tags from tasks.tags in DATABASE_URL")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Tasks per transaction")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.batch_size < 1:
+        print("Error: --batch-size must be positive")
+        sys.exit(1)
+    try:
+        backfill(arguments.batch_size)
+    finally:
+        engine.dispose()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator
+Bulk-load realistic users and tasks into DATABASE_URL for scale testing
+
+Rows are written straight to the tables: COPY on PostgreSQL, batched
+executemany on SQLite. Output is deterministic for a given --seed and --now.
+Intended for test databases; don't run it while the API is writing.
+
+Examples:
+    python generate_data.py --users 50 --tasks-per-user 2000
+    python generate_data.py --users 10 --large-users 2 --large-user-tasks 200000
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from sqlmodel import SQLModel
+from app.database import create_sqlite_search_index, engine
+from app.hashing import pwd_context
+from app import models  # noqa: F401  (registers the tables on SQLModel.metadata)
+
+TASK_COLUMNS = [
+    "id", "title", "description", "completed", "user_id", "priority",
+    "starred", "tags", "due_date", "created_at", "updated_at",
+]
+
+VERBS = [
+    "Review", "Write", "Call", "Plan", "Fix", "Update", "Send", "Book", "Clean",
+    "Prepare", "Order", "Check", "Draft", "Share", "Schedule", "Research", "Pay", "Renew",
+]
+OBJECTS = [
+    "quarterly report", "dentist appointment", "project proposal", "grocery list",
+    "team meeting notes", "car insurance", "birthday present", "budget spreadsheet",
+    "release checklist", "flight tickets", "design mockups", "tax documents",
+    "onboarding guide", "garden shed", "client invoice", "conference talk",
+    "database backup", "kitchen sink", "reading list", "gym membership",
+]
+DETAILS = [
+    "before the end of the week", "with the team", "and follow up by email",
+    "for the next sprint", "once the numbers are in", "if there is time",
+    "and update the shared folder", "ahead of the review", "with Sam", "for the family",
+]
+
+# Tag vocabulary with Zipf-like weights: a few tags are on most tasks, the
+# long tail on very few
+TAGS = [
+    "work", "personal", "urgent", "home", "errands", "finance", "health", "shopping",
+    "meeting", "learning", "travel", "family", "bug", "ideas", "someday", "reading",
+    "fitness", "admin", "garden", "car", "kids", "music", "writing", "taxes",
+]
+TAG_WEIGHTS = [1 / (rank + 1) for rank in range(len(TAGS))]
+TAG_COUNT_WEIGHTS = [30, 35, 22, 10, 3]  # tasks carrying 0, 1, 2, 3, 4 tags
+PRIORITY_WEIGHTS = {"low": 30, "medium": 50, "high": 20}
+
+
+def format_timestamp(value: datetime) -> str:
+    # Same text form SQLAlchemy writes, so string comparisons on SQLite agree
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+class TaskGenerator:
+    """Deterministic stream of task rows for one user."""
+
+    def __init__(self, rnd: random.Random, now: datetime, history_days: int, completed_ratio: float,
+                 starred_ratio: float, due_ratio: float):
+        self.rnd = rnd
+        self.now = now
+        self.history = timedelta(days=history_days)
+        self.completed_ratio = completed_ratio
+        self.starred_ratio = starred_ratio
+        self.due_ratio = due_ratio
+
+    def tasks(self, count: int):
+        """Yield (title, description, completed, priority, starred, tags, due_date, created_at, updated_at)."""
+        rnd = self.rnd
+        start = self.now - self.history
+        # Sorted creation times, so ids and created_at increase together as
+        # they do for tasks created through the API
+        offsets = sorted(rnd.random() for _ in range(count))
+        priorities, priority_weights = list(PRIORITY_WEIGHTS), list(PRIORITY_WEIGHTS.values())
+        for offset in offsets:
+            created_at = start + self.history * offset
+            age = self.now - created_at
+            # Older tasks are more likely to be done
+            completed = rnd.random() < min(1.0, self.completed_ratio * (0.5 + age / self.history))
+            updated_at = created_at + age * rnd.random() ** 3
+
+            due_date = None
+            if rnd.random() < self.due_ratio:
+                due_date = (created_at + timedelta(days=rnd.randint(0, 45))).replace(
+                    hour=rnd.choice([9, 12, 17, 23]), minute=0, second=0, microsecond=0
+                )
+
+            tag_count = rnd.choices(range(len(TAG_COUNT_WEIGHTS)), TAG_COUNT_WEIGHTS)[0]
+            tags = []
+            while len(tags) < tag_count:
+                tag = rnd.choices(TAGS, TAG_WEIGHTS)[0]
+                if tag not in tags:
+                    tags.append(tag)
+
+            title = f"{rnd.choice(VERBS)} {rnd.choice(OBJECTS)}"
+            description = None
+            if rnd.random() < 0.6:
+                description = f"{title} {rnd.choice(DETAILS)}."
+
+            yield (
+                title, description, completed, rnd.choices(priorities, priority_weights)[0],
+                rnd.random() < self.starred_ratio, tags, due_date, created_at, updated_at,
+            )
+
+
+class SQLiteWriter:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def write(self, table, columns, rows):
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        self.conn.exec_driver_sql(sql, [tuple(self.convert(value) for value in row) for row in rows])
+
+    @staticmethod
+    def convert(value):
+        if isinstance(value, datetime):
+            return format_timestamp(value)
+        if isinstance(value, list):
+            return json.dumps(value)
+        return value
+
+    def reset_sequences(self):
+        pass  # INTEGER PRIMARY KEY continues from max(rowid)
+
+
+class PostgresWriter:
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.connection.dbapi_connection.cursor()
+
+    def write(self, table, columns, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(self.convert(value) for value in row)
+        buffer.seek(0)
+        self.cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+
+    @staticmethod
+    def convert(value):
+        # An unquoted empty field is NULL in CSV COPY
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, datetime):
+            return format_timestamp(value)
+        if isinstance(value, list):
+            return json.dumps(value)
+        return value
+
+    def reset_sequences(self):
+        # Ids were assigned here, so move each serial past them
+        for table in ("users", "tasks", "tags"):
+            self.conn.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+            )
+
+
+def next_id(conn, table) -> int:
+    return conn.execute(text(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")).scalar_one()
+
+
+def generate(args):
+    rnd = random.Random(args.seed)
+    now = args.now or datetime.now(timezone.utc).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+    generator = TaskGenerator(
+        rnd, now, args.history_days, args.completed_ratio, args.starred_ratio, args.due_ratio
+    )
+    tenants = [args.large_user_tasks] * args.large_users + [args.tasks_per_user] * args.users
+
+    print("Hashing the shared password...")
+    hashed_password = pwd_context.hash(args.password)
+
+    with engine.begin() as conn:
+        SQLModel.metadata.create_all(conn)
+        create_sqlite_search_index(conn)
+
+    started = time.perf_counter()
+    total_tasks = 0
+    with engine.begin() as conn:
+        writer = PostgresWriter(conn) if conn.dialect.name == "postgresql" else SQLiteWriter(conn)
+        user_id, task_id, tag_id = next_id(conn, "users"), next_id(conn, "tasks"), next_id(conn, "tags")
+
+        for index, task_count in enumerate(tenants):
+            created_at = now - timedelta(days=args.history_days)
+            writer.write("users", ["id", "email", "name", "hashed_password", "created_at", "updated_at"], [(
+                user_id, f"{args.email_prefix}{index}@example.com", f"Load Test {index}",
+                hashed_password, created_at, created_at,
+            )])
+
+            tag_ids = {}
+            remaining = task_count
+            tasks = generator.tasks(task_count)
+            while remaining > 0:
+                batch = min(args.batch_size, remaining)
+                task_rows, link_rows, new_tags = [], [], []
+                for _ in range(batch):
+                    title, description, completed, priority, starred, tags, due_date, created, updated = next(tasks)
+                    task_rows.append((
+                        task_id, title, description, completed, user_id, priority,
+                        starred, tags or None, due_date, created, updated,
+                    ))
+                    for tag in tags:
+                        if tag not in tag_ids:
+                            tag_ids[tag] = tag_id
+                            new_tags.append((tag_id, user_id, tag))
+                            tag_id += 1
+                        link_rows.append((task_id, tag_ids[tag]))
+                    task_id += 1
+
+                writer.write("tasks", TASK_COLUMNS, task_rows)
+                if new_tags:
+                    writer.write("tags", ["id", "user_id", "name"], new_tags)
+                if link_rows:
+                    writer.write("task_tags", ["task_id", "tag_id"], link_rows)
+                remaining -= batch
+                total_tasks += batch
+
+            print(f"  {args.email_prefix}{index}@example.com: user {user_id}, {task_count} tasks")
+            user_id += 1
+
+        writer.reset_sequences()
+
+    elapsed = time.perf_counter() - started
+    print(f"\nGenerated {len(tenants)} users and {total_tasks} tasks in {elapsed:.1f}s "
+          f"({total_tasks / max(elapsed, 1e-9):,.0f} tasks/s)")
+    print(f"Every generated user's password is '{args.password}'")
+    if engine.dialect.name == "postgresql":
+        print("Run ANALYZE so the planner sees the new row counts")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic users and tasks in DATABASE_URL")
+    parser.add_argument("--users", type=int, default=10, help="Regular users to create")
+    parser.add_argument("--tasks-per-user", type=int, default=1000)
+    parser.add_argument("--large-users", type=int, default=0, help="Additional large tenants to create")
+    parser.add_argument("--large-user-tasks", type=int, default=100_000, help="Tasks per large tenant")
+    parser.add_argument("--completed-ratio", type=float, default=0.4, help="Share of tasks completed")
+    parser.add_argument("--starred-ratio", type=float, default=0.1)
+    parser.add_argument("--due-ratio", type=float, default=0.5, help="Share of tasks with a due date")
+    parser.add_argument("--history-days", type=int, default=365, help="Spread created_at over this many days")
+    parser.add_argument("--now", type=datetime.fromisoformat,
+                        help="Reference time (default: today, midnight UTC); fix it for identical output")
+    parser.add_argument("--email-prefix", default="loadtest-", help="Emails are <prefix><n>@example.com")
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per COPY/executemany call")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.users < 0 or arguments.large_users < 0 or arguments.batch_size < 1:
+        print("Error: --users, --large-users and --batch-size must be positive")
+        sys.exit(1)
+    try:
+        generate(arguments)
+    finally:
+        engine.dispose()
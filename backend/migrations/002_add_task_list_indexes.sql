@@ -0,0 +1,19 @@
+-- Migration: Add composite indexes for server-side task filtering and sorting
+-- Date: 2026-10-18
+-- Description: Every task list query filters by user_id first, so the
+-- filter/sort columns are indexed together with it.
+
+-- Default listing order (newest first)
+CREATE INDEX IF NOT EXISTS ix_tasks_user_id_created_at ON tasks(user_id, created_at);
+
+-- Active/completed filter, optionally ordered or bounded by due date
+CREATE INDEX IF NOT EXISTS ix_tasks_user_id_completed_due_date ON tasks(user_id, completed, due_date);
+
+-- Due-date range filter and due-date sort
+CREATE INDEX IF NOT EXISTS ix_tasks_user_id_due_date ON tasks(user_id, due_date);
+
+-- Priority filter
+CREATE INDEX IF NOT EXISTS ix_tasks_user_id_priority ON tasks(user_id, priority);
+
+-- Starred filter
+CREATE INDEX IF NOT EXISTS ix_tasks_user_id_starred ON tasks(user_id, starred);
@@ -0,0 +1,15 @@
+-- Migration: Support delta sync of tasks
+-- Date: 2026-10-18
+-- Description: Indexes tasks by (user_id, updated_at) and adds a tombstone
+-- table recording deleted task ids for GET /api/{user_id}/tasks/changes.
+
+CREATE INDEX IF NOT EXISTS ix_tasks_user_id_updated_at ON tasks(user_id, updated_at);
+
+CREATE TABLE IF NOT EXISTS task_deletions (
+    id SERIAL PRIMARY KEY,
+    task_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    deleted_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_task_deletions_user_id_deleted_at ON task_deletions(user_id, deleted_at);
@@ -0,0 +1,38 @@
+-- Migration: Move task tags into indexed tables
+-- Date: 2026-10-18
+-- Description: Adds the tags and task_tags tables used to filter and count
+-- tasks by tag, unwraps tag lists that were stored as a JSON-encoded string,
+-- and backfills both tables from the existing tasks.tags column. PostgreSQL
+-- only; python backfill_task_tags.py does the same on any database.
+
+CREATE TABLE IF NOT EXISTS tags (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    name VARCHAR(255) NOT NULL,
+    CONSTRAINT uq_tags_user_id_name UNIQUE (user_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS task_tags (
+    task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    tag_id INTEGER NOT NULL REFERENCES tags(id) ON DELETE CASCADE,
+    PRIMARY KEY (task_id, tag_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_task_tags_tag_id ON task_tags(tag_id);
+
+-- Older rows hold the list as a JSON string, e.g. "[\"work\"]"
+UPDATE tasks SET tags = (tags #>> '{}')::json
+WHERE tags IS NOT NULL AND json_typeof(tags) = 'string';
+
+INSERT INTO tags (user_id, name)
+SELECT DISTINCT t.user_id, tag.name
+FROM tasks t, json_array_elements_text(t.tags) AS tag(name)
+WHERE t.tags IS NOT NULL AND json_typeof(t.tags) = 'array'
+ON CONFLICT (user_id, name) DO NOTHING;
+
+INSERT INTO task_tags (task_id, tag_id)
+SELECT DISTINCT t.id, g.id
+FROM tasks t, json_array_elements_text(t.tags) AS tag(name), tags g
+WHERE t.tags IS NOT NULL AND json_typeof(t.tags) = 'array'
+  AND g.user_id = t.user_id AND g.name = tag.name
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,14 @@
+-- Migration: Full-text search over tasks
+-- Date: 2026-10-18
+-- Description: Adds a generated tsvector column over task titles (weight A)
+-- and descriptions (weight B) with a GIN index, used by
+-- GET /api/{user_id}/tasks/search. Same change as Alembic revision
+-- e4a7b2c9d1f3; PostgreSQL only (SQLite gets an FTS5 table on startup).
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector);
@@ -0,0 +1,19 @@
+-- Migration: Align task indexes with the list queries
+-- Date: 2026-10-18
+-- Description: Same change as Alembic revision 3b6f1d2a9c4e. Replaces the
+-- unscoped single-column indexes and the (user_id, priority)/(user_id,
+-- starred) indexes with ones that also cover the default created_at order,
+-- and adds a partial index for open tasks. Check the result with
+-- python test_query_plans.py.
+
+DROP INDEX IF EXISTS idx_tasks_priority;
+DROP INDEX IF EXISTS idx_tasks_starred;
+DROP INDEX IF EXISTS idx_tasks_due_date;
+DROP INDEX IF EXISTS ix_tasks_user_id_priority;
+DROP INDEX IF EXISTS ix_tasks_user_id_starred;
+
+CREATE INDEX IF NOT EXISTS ix_tasks_user_id_priority_created_at ON tasks(user_id, priority, created_at);
+CREATE INDEX IF NOT EXISTS ix_tasks_user_id_starred_created_at ON tasks(user_id, starred, created_at);
+
+-- Open tasks only: the default "active" view, newest first
+CREATE INDEX IF NOT EXISTS ix_tasks_open_user_id_created_at ON tasks(user_id, created_at) WHERE NOT completed;
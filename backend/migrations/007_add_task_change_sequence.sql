@@ -0,0 +1,19 @@
+-- Migration: Commit-ordered change sequence for delta sync
+-- Date: 2026-10-18
+-- Description: Same change as Alembic revision 7c1e9a4d2b6f. Adds the
+-- per-user task_versions counter and a change_seq column on tasks and
+-- task_deletions. GET /api/{user_id}/tasks/changes pages on (change_seq, id)
+-- instead of timestamps, which can commit out of order. Existing rows get
+-- change_seq 0, so the next sync from the beginning delivers them.
+
+CREATE TABLE IF NOT EXISTS task_versions (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    version INTEGER NOT NULL
+);
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS change_seq INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE task_deletions ADD COLUMN IF NOT EXISTS change_seq INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS ix_tasks_user_id_change_seq ON tasks(user_id, change_seq, id);
+CREATE INDEX IF NOT EXISTS ix_task_deletions_user_id_change_seq ON task_deletions(user_id, change_seq, id);
+DROP INDEX IF EXISTS ix_task_deletions_user_id_deleted_at;
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Query Plan Regression Check
+Run this to verify the task list queries are served by their indexes
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert, select
+from sqlmodel import SQLModel
+from app import crud
+from app.config import settings
+from app.database import engine
+from app.models import Tag, Task, TaskDeletion, TaskTag, User
+
+SAMPLE_TASKS = 5000
+
+
+def plan_cases(user_id):
+    """(description, statement, indexes any one of which must appear in the plan)"""
+    return [
+        (
+            "List, newest first",
+            crud.task_list_statement(user_id),
+            ["ix_tasks_user_id_created_at"],
+        ),
+        (
+            "List active tasks",
+            crud.task_list_statement(user_id, status="active"),
+            ["ix_tasks_open_user_id_created_at"],
+        ),
+        (
+            "List completed tasks by due date",
+            crud.task_list_statement(user_id, status="completed", sort="due_date", order="asc"),
+            ["ix_tasks_user_id_completed_due_date"],
+        ),
+        (
+            "List starred tasks",
+            crud.task_list_statement(user_id, starred=True),
+            ["ix_tasks_user_id_starred_created_at"],
+        ),
+        (
+            "List high priority tasks",
+            crud.task_list_statement(user_id, priority="high"),
+            ["ix_tasks_user_id_priority_created_at"],
+        ),
+        (
+            "List by due-date range",
+            crud.task_list_statement(
+                user_id, due_after=datetime(2026, 1, 1), due_before=datetime(2026, 2, 1)
+            ),
+            ["ix_tasks_user_id_due_date", "ix_tasks_user_id_completed_due_date"],
+        ),
+        (
+            "List recently updated",
+            crud.task_list_statement(user_id, sort="updated_at"),
+            ["ix_tasks_user_id_updated_at"],
+        ),
+        (
+            "List by tag",
+            crud.task_list_statement(user_id, tag="tag1"),
+            ["uq_tags_user_id_name", "sqlite_autoindex_tags_1"],
+        ),
+        (
+            "Task changes feed",
+            select(Task).where(Task.user_id == user_id).order_by(Task.change_seq, Task.id),
+            ["ix_tasks_user_id_change_seq"],
+        ),
+        (
+            "Deletion changes feed",
+            select(TaskDeletion)
+            .where(
+                TaskDeletion.user_id == user_id,
+                ~select(Task.id)
+                .where(Task.id == TaskDeletion.task_id, Task.user_id == TaskDeletion.user_id)
+                .exists(),
+            )
+            .order_by(TaskDeletion.change_seq, TaskDeletion.id),
+            ["ix_task_deletions_user_id_change_seq"],
+        ),
+    ]
+
+
+def seed_sample_data(connection):
+    """
+    Insert a realistic spread of tasks and refresh planner statistics, so
+    plans reflect real selectivity rather than empty-table defaults. The
+    caller rolls this back.
+    """
+    rnd = random.Random(0)
+    user_id = connection.execute(
+        insert(User).values(email="plan-check@example.com", name="Plan Check", hashed_password="-")
+    ).inserted_primary_key[0]
+    start = datetime(2026, 1, 1)
+    tasks = [
+        {
+            "title": f"Task {i}",
+            "user_id": user_id,
+            "completed": rnd.random() < 0.7,
+            "starred": rnd.random() < 0.05,
+            "priority": rnd.choice(["low", "medium", "medium", "high"]),
+            "due_date": start + timedelta(days=rnd.randrange(365)) if rnd.random() < 0.5 else None,
+            "created_at": start + timedelta(minutes=i),
+            "updated_at": start + timedelta(minutes=i),
+            "change_seq": i + 1,
+        }
+        for i in range(SAMPLE_TASKS)
+    ]
+    connection.execute(insert(Task), tasks)
+    connection.execute(insert(Tag), [{"user_id": user_id, "name": f"tag{i}"} for i in range(20)])
+    tag_ids = connection.execute(select(Tag.id).where(Tag.user_id == user_id)).scalars().all()
+    task_ids = connection.execute(select(Task.id).where(Task.user_id == user_id)).scalars().all()
+    connection.execute(
+        insert(TaskTag),
+        [{"task_id": task_id, "tag_id": rnd.choice(tag_ids)} for task_id in task_ids[::3]],
+    )
+    connection.exec_driver_sql("ANALYZE")
+    return user_id
+
+
+def explain(connection, statement):
+    """Return the database's plan for ``statement`` as text."""
+    is_sqlite = connection.dialect.name == "sqlite"
+    prefix = "EXPLAIN QUERY PLAN " if is_sqlite else "EXPLAIN "
+    plans = []
+
+    def capture(conn, cursor, sql, parameters, context, executemany):
+        cursor.execute(prefix + sql, parameters)
+        plans.append("\n".join(str(row[-1]) for row in cursor.fetchall()))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        connection.execute(statement).fetchall()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    return "\n".join(plans)
+
+
+def check_query_plans():
+    """Check every list/sync query against the index it is meant to use"""
+
+    print("=" * 60)
+    print("QUERY PLAN CHECK")
+    print("=" * 60)
+    print()
+    print(f"   Database URL: {settings.DATABASE_URL}")
+    print()
+
+    SQLModel.metadata.create_all(engine)
+
+    failures = 0
+    with engine.connect() as connection:
+        user_id = seed_sample_data(connection)
+
+        for description, statement, indexes in plan_cases(user_id):
+            plan = explain(connection, statement)
+            if any(index in plan for index in indexes):
+                print(f"   ✅ {description}")
+            else:
+                failures += 1
+                print(f"   ❌ {description}: expected {' or '.join(indexes)}")
+                for line in plan.splitlines():
+                    print(f"        {line}")
+
+        connection.rollback()
+
+    print()
+    print("=" * 60)
+    if failures:
+        print(f"❌ {failures} QUERIES NOT USING THEIR INDEXES")
+    else:
+        print("✅ ALL QUERIES USE THEIR INDEXES")
+    print("=" * 60)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    try:
+        success = check_query_plans()
+    finally:
+        engine.dispose()
+    sys.exit(0 if success else 1)
@@ -7,7 +7,7 @@
 
 import { useState, useEffect, useMemo, useRef, useCallback } from "react";
 import { authService } from "@/lib/auth";
-import { apiClient, type Task, type User } from "@/lib/api";
+import { apiClient, type Task, type TaskStats, type User } from "@/lib/api";
 import {
   Plus,
   Trash2,
@@ -175,6 +175,8 @@ export default function HomePage() {
   // Filter, search, sort state
   const [filter, setFilter] = useState<FilterType>("all");
   const [searchQuery, setSearchQuery] = useState("");
+  const [searchMatchIds, setSearchMatchIds] = useState<Set<number> | null>(null);
+  const [serverStats, setServerStats] = useState<TaskStats | null>(null);
   const [sortBy, setSortBy] = useState<SortType>("newest");
   const [showFilters, setShowFilters] = useState(false);
 
@@ -358,6 +360,50 @@ export default function HomePage() {
     }
   }, [theme]);
 
+  // Dashboard counters come from the server so they cover every task, not
+  // just the ones loaded; refreshed whenever the local task list changes
+  useEffect(() => {
+    if (!user) {
+      setServerStats(null);
+      return;
+    }
+    let cancelled = false;
+    apiClient
+      .getTaskStats(user.id)
+      .then((data) => {
+        if (!cancelled) setServerStats(data);
+      })
+      .catch((err) => console.error("Error loading task stats:", err));
+    return () => {
+      cancelled = true;
+    };
+  }, [tasks, user]);
+
+  // Server-side full-text search, debounced while typing
+  useEffect(() => {
+    const query = searchQuery.trim();
+    if (!user || !query) {
+      setSearchMatchIds(null);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const hits = await apiClient.searchTasks(user.id, query, 100);
+        if (!cancelled) {
+          setSearchMatchIds(new Set(hits.map((hit) => hit.task.id)));
+        }
+      } catch (err) {
+        console.error("Error searching tasks:", err);
+        if (!cancelled) setSearchMatchIds(null);
+      }
+    }, 250);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchQuery, user]);
+
   const fetchTasks = async (userId: number) => {
     setLoading(true);
     try {
@@ -386,14 +432,17 @@ export default function HomePage() {
   const filteredTasks = useMemo(() => {
     let result = [...tasks];
 
-    // Apply search filter
+    // Apply search filter: server full-text matches once available, plus
+    // tag matches (tags aren't part of the search index)
     if (searchQuery.trim()) {
-      const query = searchQuery.toLowerCase();
+      const query = searchQuery.trim().toLowerCase();
       result = result.filter(
         (task) =>
-          task.title.toLowerCase().includes(query) ||
-          (task.description &&
-            task.description.toLowerCase().includes(query)) ||
+          (searchMatchIds
+            ? searchMatchIds.has(task.id)
+            : task.title.toLowerCase().includes(query) ||
+              (task.description &&
+                task.description.toLowerCase().includes(query))) ||
           (task.tags &&
             task.tags.some((tag) => tag.toLowerCase().includes(query)))
       );
@@ -434,10 +483,24 @@ export default function HomePage() {
     });
 
     return result;
-  }, [tasks, searchQuery, filter, sortBy]);
+  }, [tasks, searchQuery, searchMatchIds, filter, sortBy]);
 
   // Enhanced Stats with Priority Counts
   const stats = useMemo(() => {
+    if (serverStats) {
+      return {
+        total: serverStats.total,
+        completed: serverStats.completed,
+        active: serverStats.active,
+        completionRate: serverStats.completion_rate,
+        starred: serverStats.starred,
+        highPriority: serverStats.high_priority,
+        mediumPriority: serverStats.medium_priority,
+        lowPriority: serverStats.low_priority,
+        productivityScore: serverStats.productivity_score,
+      };
+    }
+
     const total = tasks.length;
     const completed = tasks.filter((t) => t.completed).length;
     const active = total - completed;
@@ -469,7 +532,7 @@ export default function HomePage() {
       lowPriority,
       productivityScore,
     };
-  }, [tasks]);
+  }, [tasks, serverStats]);
 
   // Mock streak data
   const streak = useMemo(
@@ -725,18 +788,19 @@ export default function HomePage() {
   const deleteCompletedTasks = async () => {
     if (loading || !user) return;
 
-    const completedTasks = tasks.filter((task) => task.completed);
-    if (completedTasks.length === 0) return;
+    // Counted by the server, so tasks on pages not loaded yet are included
+    if (stats.completed === 0) return;
 
-    if (!confirm(`Delete ${completedTasks.length} completed tasks?`)) return;
+    if (!confirm(`Delete ${stats.completed} completed tasks?`)) return;
 
     setLoading(true);
     try {
       setError(null);
-      // Delete all completed tasks
-      for (const task of completedTasks) {
-        await apiClient.deleteTask(user.id, task.id);
-      }
+      // Select by filter rather than by id, so every completed task is
+      // deleted in a single request however many there are
+      await apiClient.bulkDeleteTasks(user.id, {
+        filter: { status: "completed" },
+      });
       setTasks(tasks.filter((task) => !task.completed));
     } catch (err) {
       const message =
@@ -754,9 +818,12 @@ export default function HomePage() {
     setLoading(true);
     try {
       setError(null);
-      const incompleteTasks = tasks.filter((task) => !task.completed);
-      for (const task of incompleteTasks) {
-        await apiClient.updateTaskCompletion(user.id, task.id, true);
+      if (stats.active > 0) {
+        await apiClient.bulkUpdateTasks(
+          user.id,
+          { filter: { status: "active" } },
+          { completed: true }
+        );
       }
       setTasks(tasks.map((task) => ({ ...task, completed: true })));
     } catch (err) {
@@ -18,6 +18,63 @@ interface Task {
   updated_at: string;
 }
 
+interface TaskQuery {
+  status?: 'all' | 'active' | 'completed';
+  starred?: boolean;
+  priority?: 'low' | 'medium' | 'high';
+  tag?: string;
+  due_after?: string;
+  due_before?: string;
+  q?: string;
+  sort?: 'created_at' | 'updated_at' | 'due_date' | 'title' | 'priority';
+  order?: 'asc' | 'desc';
+  limit?: number;
+  cursor?: string;
+  // Comma-separated Task fields to return (id is always included)
+  fields?: string;
+}
+
+interface BulkResult {
+  affected_ids: number[];
+}
+
+interface TaskSearchHit {
+  task: Task;
+  rank: number;
+  title_highlight: string | null;
+  description_highlight: string | null;
+}
+
+interface TaskStats {
+  total: number;
+  completed: number;
+  active: number;
+  completion_rate: number;
+  starred: number;
+  high_priority: number;
+  medium_priority: number;
+  low_priority: number;
+  overdue: number;
+  productivity_score: number;
+}
+
+interface TagCount {
+  name: string;
+  count: number;
+}
+
+interface TaskChanges {
+  tasks: Task[];
+  deleted_ids: number[];
+  watermark: string;
+  has_more: boolean;
+}
+
+interface TaskPage {
+  items: Task[];
+  next_cursor: string | null;
+}
+
 interface LoginResponse {
   access_token: string;
   token_type: string;
@@ -190,9 +247,51 @@ export const apiClient = {
     clearStorage();
   },
 
-  async getTasks(userId: number): Promise<Task[]> {
+  async getTaskPage(userId: number, query: TaskQuery = {}): Promise<TaskPage> {
     console.log('[API] === GET TASKS for user', userId, '===');
-    return makeRequest<Task[]>(`/${userId}/tasks`);
+    const params = new URLSearchParams();
+    Object.entries(query).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') {
+        params.set(key, String(value));
+      }
+    });
+    const search = params.toString();
+    return makeRequest<TaskPage>(`/${userId}/tasks${search ? `?${search}` : ''}`);
+  },
+
+  async getTasks(userId: number, query: TaskQuery = {}): Promise<Task[]> {
+    const page = await apiClient.getTaskPage(userId, query);
+    return page.items;
+  },
+
+  async getTaskChanges(userId: number, since?: string): Promise<TaskChanges> {
+    const search = since ? `?since=${encodeURIComponent(since)}` : '';
+    return makeRequest<TaskChanges>(`/${userId}/tasks/changes${search}`);
+  },
+
+  async getTaskStats(userId: number): Promise<TaskStats> {
+    return makeRequest<TaskStats>(`/${userId}/tasks/stats`);
+  },
+
+  async searchTasks(userId: number, q: string, limit = 20): Promise<TaskSearchHit[]> {
+    const search = new URLSearchParams({ q, limit: String(limit) });
+    return makeRequest<TaskSearchHit[]>(`/${userId}/tasks/search?${search}`);
+  },
+
+  async getTagCounts(userId: number): Promise<TagCount[]> {
+    return makeRequest<TagCount[]>(`/${userId}/tags`);
+  },
+
+  // All of the user's tasks as a downloadable file
+  async exportTasks(userId: number, format: 'ndjson' | 'csv' = 'csv'): Promise<Blob> {
+    const token = getStoredToken();
+    const response = await fetch(`${API_BASE_URL}/${userId}/tasks/export?format=${format}`, {
+      headers: token ? { Authorization: `Bearer ${token}` } : {},
+    });
+    if (!response.ok) {
+      throw new Error(`Export failed: ${response.status}`);
+    }
+    return response.blob();
   },
 
   async createTask(userId: number, task: {
@@ -210,8 +309,24 @@ export const apiClient = {
     });
   },
 
-  async getTask(userId: number, taskId: number): Promise<Task> {
-    return makeRequest<Task>(`/${userId}/tasks/${taskId}`);
+  async createTasks(userId: number, tasks: {
+    title: string;
+    description?: string;
+    priority?: string;
+    starred?: boolean;
+    tags?: string[];
+    due_date?: string;
+  }[]): Promise<Task[]> {
+    console.log('[API] === CREATE TASKS (batch) ===');
+    return makeRequest<Task[]>(`/${userId}/tasks/batch`, {
+      method: 'POST',
+      body: JSON.stringify({ tasks }),
+    });
+  },
+
+  async getTask(userId: number, taskId: number, fields?: string): Promise<Task> {
+    const search = fields ? `?fields=${encodeURIComponent(fields)}` : '';
+    return makeRequest<Task>(`/${userId}/tasks/${taskId}${search}`);
   },
 
   async updateTask(userId: number, taskId: number, task: Partial<Task>): Promise<Task> {
@@ -229,6 +344,81 @@ export const apiClient = {
     });
   },
 
+  async bulkUpdateTasks(
+    userId: number,
+    selection: { ids?: number[]; filter?: TaskQuery },
+    changes: Partial<Task>
+  ): Promise<BulkResult> {
+    console.log('[API] === BULK UPDATE TASKS ===');
+    return makeRequest<BulkResult>(`/${userId}/tasks/bulk/update`, {
+      method: 'POST',
+      body: JSON.stringify({ ...selection, changes }),
+    });
+  },
+
+  async bulkDeleteTasks(
+    userId: number,
+    selection: { ids?: number[]; filter?: TaskQuery }
+  ): Promise<BulkResult> {
+    console.log('[API] === BULK DELETE TASKS ===');
+    return makeRequest<BulkResult>(`/${userId}/tasks/bulk/delete`, {
+      method: 'POST',
+      body: JSON.stringify(selection),
+    });
+  },
+
+  // Live task changes over Server-Sent Events; returns a function that closes the stream.
+  // EventSource can't send headers, so each connection opens with a short-lived stream
+  // ticket instead of the access token
+  subscribeToTaskEvents(
+    userId: number,
+    onEvent: (event: { type: string; task?: Task; task_id?: number }) => void
+  ): () => void {
+    let source: EventSource | null = null;
+    let closed = false;
+    let reconnecting = false;
+
+    const connect = async () => {
+      let ticket: string;
+      try {
+        ({ ticket } = await makeRequest<{ ticket: string; expires_in: number }>(
+          `/${userId}/events/ticket`,
+          { method: 'POST' }
+        ));
+      } catch (error) {
+        console.error('[API] Could not get an event stream ticket:', error);
+        if (!closed) setTimeout(connect, 5000);
+        return;
+      }
+      if (closed) return;
+
+      const stream = new EventSource(`${API_BASE_URL}/${userId}/events?ticket=${encodeURIComponent(ticket)}`);
+      source = stream;
+      ['task.created', 'task.updated', 'task.deleted', 'resync'].forEach((type) => {
+        stream.addEventListener(type, (message) => {
+          onEvent(JSON.parse((message as MessageEvent).data));
+        });
+      });
+      stream.onopen = () => {
+        // Events sent while disconnected are lost; tell the caller to catch up
+        if (reconnecting) onEvent({ type: 'resync' });
+        reconnecting = false;
+      };
+      // The browser retries dropped connections with the same URL, which is
+      // refused once the ticket expires; then start over with a new ticket
+      stream.onerror = () => {
+        reconnecting = true;
+        if (stream.readyState === EventSource.CLOSED && !closed) setTimeout(connect, 1000);
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      source?.close();
+    };
+  },
+
   async deleteTask(userId: number, taskId: number): Promise<{ message: string }> {
     console.log('[API] === DELETE TASK ===');
     return makeRequest<{ message: string }>(`/${userId}/tasks/${taskId}`, {
@@ -237,4 +427,4 @@ export const apiClient = {
   },
 };
 
-export type { Task, LoginResponse, User };
+export type { Task, TaskQuery, TaskPage, TaskChanges, TaskSearchHit, TaskStats, TagCount, LoginResponse, User };